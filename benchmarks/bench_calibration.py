@@ -0,0 +1,75 @@
+"""
+Speed and parity of the analytic and simulated Hull-White volatility in
+``calibrate.calibration_error``.
+
+Run with ``python -m benchmarks.bench_calibration``.
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+from scipy.optimize import minimize
+
+from benchmarks.bench_snapshot import synthetic_curve
+from finance.calibrate import (
+    SURFACE_MATURITIES,
+    analytic_hw_volatility,
+    calibration_error,
+    simulate_hw_paths,
+)
+
+
+def main():
+    curve = synthetic_curve()
+    handle = ql.YieldTermStructureHandle(curve)
+    model = ql.HullWhite(handle, 0.05, 0.001)
+
+    print("parity (analytic vs 50k simulated paths):")
+    for a, sigma in [(0.05, 0.001), (0.2, 0.002)]:
+        model.setParams([a, sigma])
+        analytic = analytic_hw_volatility(a, sigma, handle, SURFACE_MATURITIES)
+        simulated = np.array(
+            [
+                simulate_hw_paths(model, handle, years, 50000, seed=0)
+                for years in SURFACE_MATURITIES
+            ]
+        )
+        error = np.max(np.abs(simulated / analytic - 1))
+        print(f"  a={a} sigma={sigma}: max relative difference {error:.2%}")
+
+    surface = pd.DataFrame(
+        {
+            f"{years}Y Volatility": [0.05 + 0.002 * years]
+            for years in SURFACE_MATURITIES
+        }
+    )
+    params = [0.05, 0.001]
+    for method in ["analytic", "simulation"]:
+        seconds = (
+            timeit.timeit(
+                lambda: calibration_error(
+                    params, model, handle, surface, method
+                ),
+                number=5,
+            )
+            / 5
+        )
+        print(f"{method:>10} objective: {seconds * 1000:9.2f} ms")
+
+    result = minimize(
+        calibration_error,
+        params,
+        args=(model, handle, surface, "analytic"),
+        method="L-BFGS-B",
+        bounds=[(1e-4, None), (1e-5, None)],
+    )
+    print(
+        f"analytic fit: a={result.x[0]:.4f} sigma={result.x[1]:.5f} "
+        f"error={result.fun:.2e} in {result.nfev} evaluations"
+    )
+
+
+if __name__ == "__main__":
+    main()
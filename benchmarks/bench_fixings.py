@@ -0,0 +1,70 @@
+"""
+Benchmark ``add_fixings_to_curve`` against the original row-by-row loop.
+
+Run with ``python -m benchmarks.bench_fixings``.
+"""
+
+import timeit
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from finance.dates import business_day_table
+from finance.fixings import add_fixings_to_curve
+
+
+def add_fixings_to_curve_loop(calendar, deposit_rate, all_fixings):
+    """The per-row implementation ``add_fixings_to_curve`` replaced."""
+    fixing_dates = []
+    fixing_rates = []
+    last_rate = None
+    fixings = all_fixings.to_dict(orient="records")
+    for row in fixings:
+        date = row["date"]
+        rate = row["rate"]
+        date_ql = ql.Date(date.day, date.month, date.year)
+        if calendar.isBusinessDay(date_ql):
+            last_rate = rate
+            fixing_dates.append(date_ql)
+            fixing_rates.append(rate / 100)
+    deposit_rate.addFixings(fixing_dates, fixing_rates, forceOverwrite=True)
+    return last_rate
+
+
+def daily_history(years=30, end=date(2024, 10, 16)):
+    rng = np.random.default_rng(0)
+    days = [end - timedelta(days=n) for n in range(365 * years, -1, -1)]
+    rates = 3 + np.cumsum(rng.normal(0, 0.01, len(days)))
+    return pd.DataFrame({"date": days, "rate": rates})
+
+
+def main(repeat=5):
+    calendar = ql.TARGET()
+    index = ql.Euribor6M()
+    fixings = daily_history()
+    business_day_table(calendar)
+
+    loop = min(
+        timeit.repeat(
+            lambda: add_fixings_to_curve_loop(calendar, index, fixings),
+            number=1,
+            repeat=repeat,
+        )
+    )
+    vectorized = min(
+        timeit.repeat(
+            lambda: add_fixings_to_curve(calendar, index, fixings),
+            number=1,
+            repeat=repeat,
+        )
+    )
+    print(f"rows: {len(fixings)}")
+    print(f"loop:       {loop * 1000:8.2f} ms")
+    print(f"vectorized: {vectorized * 1000:8.2f} ms")
+    print(f"speed-up:   {loop / vectorized:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Cold-start import time of the API, against also loading the modules it
+now defers (matplotlib, pandas, pyarrow, scipy).
+
+Every measurement is a fresh interpreter run with ``-X importtime``. The
+run fails when the fastest ``import finance.app`` exceeds its budget.
+
+Run with ``python -m benchmarks.bench_import``.
+"""
+
+import os
+import subprocess
+import sys
+
+DEFERRED = "matplotlib.pyplot, pandas, pyarrow.parquet, scipy.optimize"
+# Budget, in milliseconds, of `import finance.app`: 0.6-0.8 s here with the
+# deferred modules, against 1.4-1.8 s when they were imported eagerly
+IMPORT_BUDGET_MS = float(os.environ.get("FINANCE_IMPORT_BUDGET_MS", 1200))
+
+
+def import_times(statement):
+    """Self and cumulative import time, in us, of every module loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def total(times):
+    return sum(own for own, _ in times.values()) / 1000
+
+
+def main(repeat=5):
+    fastest = {}
+    for label, statement in [
+        ("finance.app", "import finance.app"),
+        ("+ deferred", f"import finance.app, {DEFERRED}"),
+    ]:
+        runs = [import_times(statement) for _ in range(repeat)]
+        fastest[label] = min(runs, key=total)
+        print(
+            f"{label:>12}: {total(fastest[label]):7.1f} ms, "
+            f"{len(fastest[label])} modules"
+        )
+    print("slowest modules of finance.app (self time):")
+    slowest = sorted(
+        fastest["finance.app"].items(), key=lambda item: -item[1][0]
+    )
+    for name, (own, _) in slowest[:10]:
+        print(f"  {name:<40} {own / 1000:6.1f} ms")
+
+    _, cumulative = fastest["finance.app"]["finance.app"]
+    within = cumulative / 1000 < IMPORT_BUDGET_MS
+    print(
+        f"import finance.app: {cumulative / 1000:.1f} ms, budget "
+        f"{IMPORT_BUDGET_MS:.0f} ms: {'ok' if within else 'EXCEEDED'}"
+    )
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
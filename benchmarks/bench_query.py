@@ -0,0 +1,143 @@
+"""
+Client-side cost of reading query results: the original DataFrame path
+against the columnar layer of ``finance.db``.
+
+The pool is replaced by a fake cursor serving rows that are already in
+memory, as psycopg returns them (dates and Decimals). Only the client-side
+work is timed, not the network or the server.
+
+Run with ``python -m benchmarks.bench_query``.
+"""
+
+import asyncio
+import contextlib
+import io
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pandas as pd
+
+from finance import db
+from finance.fixings import FIXING_DTYPES
+
+
+class FakeCursor:
+    def __init__(self, server):
+        self.server = server
+        self.description = None
+        self._rows = []
+
+    async def execute(self, query, args=None):
+        self._rows = []
+        self.description = None
+        if query.startswith("DECLARE"):
+            self.server.position = 0
+        elif query.startswith("FETCH"):
+            size = int(query.split()[2])
+            position = self.server.position
+            end = position + size
+            self._rows = self.server.rows[position:end]
+            self.server.position += size
+        elif query.startswith(("SELECT", "EXECUTE")):
+            self._rows = self.server.rows
+        else:
+            return
+        self.description = [(column,) for column in self.server.columns]
+
+    async def fetchall(self):
+        return list(self._rows)
+
+
+class FakePool:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        yield self
+
+    @contextlib.asynccontextmanager
+    async def cursor(self):
+        yield FakeCursor(self)
+
+
+async def query_db_original(query, args=None):
+    """The ``query_db`` the columnar layer replaced."""
+    print(f"Executing query: {query}")
+    await db.init_db_pool()
+    async with db.pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            if args is None:
+                await cur.execute(query)
+            else:
+                await cur.execute(query, args)
+            data = await cur.fetchall()
+            columns = [desc[0] for desc in cur.description]
+            return pd.DataFrame(data, columns=columns)
+
+
+async def original(query):
+    return (await query_db_original(query)).to_dict(orient="records")
+
+
+async def columnar(query):
+    return await db.fetch_columns(query, dtypes=FIXING_DTYPES)
+
+
+async def prepared(query):
+    return await db.fetch_columns(query, dtypes=FIXING_DTYPES, prepared=True)
+
+
+async def batches(query):
+    return [batch async for batch in db.fetch_batches(query, None)]
+
+
+def fixings_rows(years):
+    end = date(2024, 10, 16)
+    return [
+        (end - timedelta(days=n), Decimal(f"{3 + 0.0001 * n:.4f}"))
+        for n in range(365 * years, -1, -1)
+    ]
+
+
+def best_time(func, query, repeat):
+    async def run():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await func(query)
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(run())
+
+
+def main():
+    query = "SELECT date, rate FROM taxa_fixa_fixings_historical"
+    for label, rows, repeat in [
+        ("swap quotes", fixings_rows(1)[:30], 2000),
+        ("30Y fixings", fixings_rows(30), 20),
+    ]:
+        db.pool = FakePool(["date", "rate"], rows)
+        db._prepared.clear()
+        timings = {
+            name: best_time(func, query, repeat)
+            for name, func in [
+                ("original", original),
+                ("columnar", columnar),
+                ("prepared", prepared),
+                ("batches", batches),
+            ]
+        }
+        print(f"{label} ({len(rows)} rows)")
+        for name, seconds in timings.items():
+            speed_up = timings["original"] / seconds
+            print(f"  {name:>9}: {seconds * 1e6:10.1f} us  {speed_up:5.1f}x")
+    db.pool = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Accuracy and speed of ``CurveSnapshot`` against the QuantLib curve.
+
+Run with ``python -m benchmarks.bench_snapshot``.
+"""
+
+import timeit
+
+import numpy as np
+import QuantLib as ql
+
+from finance.snapshot import CurveSnapshot, accuracy_report
+
+
+def synthetic_curve():
+    """A 6M Euribor curve bootstrapped from fixed synthetic quotes."""
+    ql.Settings.instance().evaluationDate = ql.Date(16, 10, 2024)
+    calendar = ql.TARGET()
+    index = ql.Euribor6M()
+    helpers = [
+        ql.DepositRateHelper(
+            ql.QuoteHandle(ql.SimpleQuote(0.035)),
+            ql.Period(6, ql.Months),
+            2,
+            calendar,
+            ql.Following,
+            False,
+            ql.Actual360(),
+        )
+    ]
+    for years, rate in [(1, 3.1), (2, 2.9), (5, 2.7), (10, 2.8), (30, 2.6)]:
+        helpers.append(
+            ql.SwapRateHelper(
+                ql.QuoteHandle(ql.SimpleQuote(rate / 100)),
+                ql.Period(years, ql.Years),
+                calendar,
+                ql.Annual,
+                ql.Unadjusted,
+                ql.Thirty360(ql.Thirty360.BondBasis),
+                index,
+                ql.QuoteHandle(),
+                ql.Period(0, ql.Days),
+            )
+        )
+    curve = ql.PiecewiseLogCubicDiscount(
+        0, calendar, helpers, ql.Actual365Fixed()
+    )
+    curve.enableExtrapolation()
+    return curve
+
+
+def main(points=1_000_000):
+    curve = synthetic_curve()
+    for step_days in [1, 7, 30]:
+        snapshot = CurveSnapshot.from_curve(curve, step_days=step_days)
+        report = accuracy_report(snapshot, curve)
+        errors = ", ".join(f"{k}={v:.2e}" for k, v in report.items())
+        print(f"grid {step_days:>2}d max errors: {errors}")
+
+    snapshot = CurveSnapshot.from_curve(curve)
+    export = timeit.timeit(lambda: CurveSnapshot.from_curve(curve), number=3)
+    print(f"export:                   {export / 3 * 1000:8.2f} ms")
+
+    times = np.random.default_rng(0).uniform(0, 30, points)
+    quantlib = timeit.timeit(
+        lambda: [curve.discount(t) for t in times[:100_000]], number=1
+    )
+    vectorized = timeit.timeit(lambda: snapshot.discount(times), number=1)
+    print(f"QuantLib discount/point:  {quantlib / 100_000 * 1e9:8.1f} ns")
+    print(f"snapshot discount/point:  {vectorized / points * 1e9:8.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Tail latency of cheap requests while curves are rebuilt, per executor.
+
+A background client keeps invalidating the curve cache and requesting
+``/forward_curve`` so that a bootstrap is always running, while a second
+client polls ``/cache_stats`` and records its latency. Data comes from an
+in-memory stand-in for the database, ``benchmarks.synthetic``, whose swap
+quotes move on every read so that every build is a real bootstrap.
+
+Run with ``python -m benchmarks.load_app``.
+"""
+
+import asyncio
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import QuantLib as ql
+
+from benchmarks.synthetic import END, SyntheticMarket
+from finance import app, euribor, executor, market_cache
+
+
+async def measure(client, duration, rebuilding=True):
+    stop = time.perf_counter() + duration
+
+    async def rebuild():
+        builds = 0
+        while rebuilding and time.perf_counter() < stop:
+            euribor._cache.invalidate()
+            await client.get("/forward_curve", params={"index": "6M"})
+            builds += 1
+        return builds
+
+    async def poll():
+        # Requests are due every 2 ms; latency counts from when a request
+        # was due, so time spent waiting for a blocked loop is included
+        latencies = []
+        due = time.perf_counter()
+        while due < stop:
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/cache_stats")
+            latencies.append(time.perf_counter() - due)
+            due += 0.002
+        return np.array(latencies) * 1000
+
+    return await asyncio.gather(rebuild(), poll())
+
+
+async def run(kind, duration, rebuilding=True):
+    executor.EXECUTOR = kind
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as client:
+        # Warm up the curve, the pools and the request path
+        await client.get("/forward_curve", params={"index": "6M"})
+        for _ in range(50):
+            await client.get("/cache_stats")
+        builds, latencies = await measure(client, duration, rebuilding)
+    executor.shutdown_executors()
+    p50, p99 = np.percentile(latencies, [50, 99])
+    label = kind if rebuilding else "idle"
+    print(
+        f"{label:>8}: {builds:4d} builds, /cache_stats "
+        f"p50 {p50:6.2f} ms  p99 {p99:6.2f} ms  max {latencies.max():6.2f} ms"
+    )
+
+
+def main(duration=5.0):
+    ql.Settings.instance().evaluationDate = ql.Date(
+        END.day, END.month, END.year
+    )
+    SyntheticMarket(years=10, swap_tenors=30, moving=True).use()
+    with tempfile.TemporaryDirectory() as directory:
+        market_cache.MARKET_CACHE_DIR = directory
+        asyncio.run(run("inline", duration, rebuilding=False))
+        for kind in ["inline", "thread", "process"]:
+            asyncio.run(run(kind, duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Benchmark suite of the hot paths at several data sizes, on synthetic market
+data, with results saved to compare commits.
+
+Market data comes from ``benchmarks.synthetic.SyntheticMarket`` through the
+``finance.db`` backend hook, so no database is needed and every commit is
+timed on the same inputs. Curves are bootstrapped inline on the calling
+thread, so executor hand-offs are not part of the timings.
+
+Results are written as JSON to benchmarks/results/<commit>.json; passing
+the file of another commit to ``--compare`` prints the ratio of every case
+and exits with status 1 when one got slower than ``--tolerance`` allows:
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --compare benchmarks/results/<commit>.json
+
+Run ``python -m benchmarks.suite --help`` for the other options.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from benchmarks.synthetic import END, SyntheticMarket
+from finance import (
+    db,
+    euribor_1m,
+    euribor_3m,
+    euribor_6m,
+    executor,
+    market_cache,
+)
+from finance.calibrate import calculate_volatility, calibrate_to_fixings
+from finance.fixings import add_fixings_to_curve
+from finance.hull_white import simulate_short_rates
+from finance.market_data import MarketSnapshot, load_snapshot
+from finance.mortgage import calculate_mortgage_payments
+from finance.utils import curve_values
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# Slow-down, relative to the compared results, reported as a regression
+TOLERANCE = 0.2
+# Hull-White parameters of the simulations
+A, SIGMA = 0.03, 0.01
+BUILDERS = {
+    "1M": euribor_1m.curve,
+    "3M": euribor_3m.curve,
+    "6M": euribor_6m.curve,
+}
+
+
+def bootstrap_case(index, market, size):
+    """Bootstrap ``index`` from ``size`` swap quotes that move every call."""
+    loop = asyncio.new_event_loop()
+    # Load the fixings once through the backend, as a cold start does
+    market.use()
+    snapshot = loop.run_until_complete(load_snapshot("EURIBOR", [index]))
+    loop.run_until_complete(BUILDERS[index](snapshot))
+    since = {index: snapshot.last_fixing_date(index)}
+    fixings = snapshot.fixings[index]
+    no_fixings = {index: {column: fixings[column][:0] for column in fixings}}
+    shifts = itertools.cycle(np.arange(1, 101) * 1e-4)
+
+    def run():
+        quotes = market.swap_quotes(index, next(shifts))
+        swaps = {column: values[:size] for column, values in quotes.items()}
+        moved = MarketSnapshot({index: swaps}, no_fixings, since)
+        return loop.run_until_complete(BUILDERS[index](moved))
+
+    return run
+
+
+def curve_values_case(market, size):
+    """Forward rates of a 6M curve over ``size`` (horizon/step)."""
+    curve = bootstrap_case("6M", market, 30)()
+    horizon, step = size.split("/")
+    return functools.partial(curve_values, curve, "6M", horizon, step)
+
+
+def add_fixings_case(market, size):
+    """Push ``size`` years of daily fixings into a Euribor index."""
+    fixings = market.fixings_columns("6M", size)
+    calendar = ql.TARGET()
+    index = ql.Euribor6M()
+    return functools.partial(add_fixings_to_curve, calendar, index, fixings)
+
+
+def volatility_case(market, size):
+    """Rolling volatility surface of ``size`` years of fixings."""
+    fixings = pd.DataFrame(market.fixings_columns("6M", size))
+    return functools.partial(calculate_volatility, fixings)
+
+
+def calibration_case(market, size):
+    """Fit Hull-White to ``size`` years of fixings."""
+    curve = bootstrap_case("6M", market, 30)()
+    fixings = pd.DataFrame(market.fixings_columns("6M", size))
+    fixings["rate"] /= 100
+    return functools.partial(calibrate_to_fixings, curve, fixings)
+
+
+def simulation_case(market, size):
+    """``size`` Hull-White paths of 30 years on a monthly grid."""
+    curve = bootstrap_case("6M", market, 30)()
+    times = np.linspace(0.0, 30.0, 361)
+    return functools.partial(
+        simulate_short_rates, curve, A, SIGMA, times, size, seed=0
+    )
+
+
+def mortgage_case(market, size):
+    """30-year mortgage payments along a path with ``size`` steps a year."""
+    curve = bootstrap_case("6M", market, 30)()
+    times = np.linspace(0.0, 30.0, 30 * size + 1)
+    (path,) = simulate_short_rates(curve, A, SIGMA, times, 1, seed=0)
+    return functools.partial(
+        calculate_mortgage_payments, path, times, 145000, 30
+    )
+
+
+# Name, data sizes and setup of every case; the setup returns the function
+# that is timed
+CASES = [
+    *[
+        (
+            f"bootstrap_{index}",
+            [10, 30],
+            functools.partial(bootstrap_case, index),
+        )
+        for index in BUILDERS
+    ],
+    ("curve_values", ["5Y/1M", "30Y/1M", "30Y/1W"], curve_values_case),
+    ("add_fixings_to_curve", [1, 10, 30], add_fixings_case),
+    ("calculate_volatility", [5, 10, 30], volatility_case),
+    ("calibrate_to_fixings", [1, 10, 30], calibration_case),
+    ("simulate_short_rates", [1000, 10000], simulation_case),
+    ("calculate_mortgage_payments", [12, 52, 365], mortgage_case),
+]
+
+
+def measure(func, repeat, min_time):
+    """
+    Seconds per call of ``func``, one sample per repeat.
+
+    Every sample runs ``func`` as often as needed to last about
+    ``min_time``, after a warm-up call.
+    """
+    func()
+    start = time.perf_counter()
+    func()
+    number = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def run(selected=None, repeat=5, min_time=0.05):
+    """
+    Time the cases whose name contains ``selected`` (all when None).
+
+    Returns:
+    list: One dict per case and size with 'case', 'size', 'best_ms' and
+        'median_ms'.
+    """
+    ql.Settings.instance().evaluationDate = ql.Date(
+        END.day, END.month, END.year
+    )
+    executor.EXECUTOR = "inline"
+    market = SyntheticMarket(years=30, swap_tenors=30)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        # Keep the on-disk market cache of the machine out of the runs
+        market_cache.MARKET_CACHE_DIR = directory
+        try:
+            for name, sizes, setup in CASES:
+                if selected and selected not in name:
+                    continue
+                for size in sizes:
+                    # Some code paths print, which is not what is timed
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        samples = measure(
+                            setup(market, size), repeat, min_time
+                        )
+                    result = {
+                        "case": name,
+                        "size": size,
+                        "best_ms": min(samples) * 1000,
+                        "median_ms": statistics.median(samples) * 1000,
+                    }
+                    print(
+                        f"{name:>28} {str(size):>7}: "
+                        f"{result['best_ms']:10.3f} ms  "
+                        f"(median {result['median_ms']:.3f} ms)"
+                    )
+                    results.append(result)
+        finally:
+            db.use_backend(None)
+    return results
+
+
+def git_commit():
+    """Short hash of HEAD, with "-dirty" for uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return commit + "-dirty" if status else commit
+
+
+def save(results, path=None):
+    """
+    Write ``results`` with the commit and environment they were timed on.
+
+    Returns:
+    str: Path of the JSON file.
+    """
+    commit = git_commit()
+    path = path or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    report = {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "quantlib": ql.__version__,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+    return path
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """
+    Print the time of every case against ``baseline``, another saved
+    report, using the best time of each.
+
+    Returns:
+    list: (case, size) of the cases slower than ``1 + tolerance`` times
+        the baseline.
+    """
+    before = {
+        (result["case"], str(result["size"])): result["best_ms"]
+        for result in baseline["results"]
+    }
+    print(f"\ncompared with {baseline['commit']}:")
+    regressions = []
+    for result in results:
+        key = (result["case"], str(result["size"]))
+        if key not in before:
+            continue
+        ratio = result["best_ms"] / before[key]
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(
+            f"{key[0]:>28} {key[1]:>7}: {before[key]:10.3f} -> "
+            f"{result['best_ms']:10.3f} ms  {ratio:5.2f}x{flag}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-k", dest="selected", help="only run cases containing this"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="seconds each sample lasts at least",
+    )
+    parser.add_argument("--output", help="JSON file of the results")
+    parser.add_argument("--compare", help="JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run(args.selected, args.repeat, args.min_time)
+    print(f"\nsaved to {save(results, args.output)}")
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
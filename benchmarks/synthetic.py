@@ -0,0 +1,135 @@
+"""
+Deterministic synthetic Euribor market data, served in place of the
+database through ``finance.db.use_backend``.
+
+It answers the queries the finance loaders send: the market snapshot, swap
+quotes and fixings. The same seed always gives the same data, so timings of
+different commits see identical inputs.
+"""
+
+import re
+from datetime import date, timedelta
+
+import numpy as np
+
+from finance import db
+
+END = date(2024, 10, 16)
+# Level, in percent, of the fixings and swap quotes of every index
+INDEX_LEVELS = {"1M": 3.2, "3M": 3.3, "6M": 3.4}
+
+
+class SyntheticMarket:
+    """
+    Daily fixings following a seeded random walk and yearly swap quotes on
+    a smooth curve, for every index of ``INDEX_LEVELS``.
+
+    Parameters:
+    years (int): Years of daily fixings per index, up to ``end``.
+    swap_tenors (int): Swap quotes per index, 1Y to ``swap_tenors`` Y.
+    seed (int): Seed of the fixings.
+    end (date): Date of the last fixing.
+    moving (bool): Shift the swap quotes on every read, so that curves
+        built from consecutive reads are real bootstraps.
+    """
+
+    def __init__(
+        self, years=10, swap_tenors=30, seed=0, end=END, moving=False
+    ):
+        self.moving = moving
+        self.reads = 0
+        rng = np.random.default_rng(seed)
+        days = 365 * years + 1
+        self.dates = [end - timedelta(days=n) for n in range(days - 1, -1, -1)]
+        self.fixings = {}
+        self.swaps = {}
+        for index, level in INDEX_LEVELS.items():
+            walk = np.cumsum(rng.normal(0.0, 0.01, days))
+            rates = np.round(level + walk - walk[-1], 4).tolist()
+            self.fixings[index] = list(zip(self.dates, rates))
+            tenors = np.arange(1, swap_tenors + 1)
+            self.swaps[index] = {
+                "tenor": [f"{tenor}Y" for tenor in tenors],
+                "rate": (level - 0.8 + 0.4 * np.exp(-tenors / 5)).tolist(),
+            }
+
+    def use(self):
+        """Serve every query from this market instead of the database."""
+        db.use_backend(self.fetch)
+
+    def fixings_columns(self, index="6M", years=None):
+        """The last ``years`` of fixings of ``index`` as 'date'/'rate'."""
+        rows = self.fixings[index]
+        if years is not None:
+            days = 365 * years + 1
+            rows = rows[-days:]
+        return db.to_columns(["date", "rate"], rows)
+
+    def swap_quotes(self, index, shift=0.0):
+        """'tenor' and 'rate' arrays of the swap quotes, moved by ``shift``."""
+        swaps = self.swaps[index]
+        return {
+            "tenor": np.array(swaps["tenor"]),
+            "rate": np.array(swaps["rate"]) + shift,
+        }
+
+    async def fetch(self, query, args=None):
+        """Answer ``query`` like ``finance.db.fetch``."""
+        self.reads += 1
+        shift = 1e-4 * (self.reads % 100) if self.moving else 0.0
+        if "UNION ALL" in query:
+            return self._snapshot(query, args, shift)
+        if "taxa_fixa_swap_rates_real_time" in query:
+            return self._swap_rows(query, shift)
+        index = _index(query)
+        return ["date", "rate"], self._fixing_rows(index, _since(query))
+
+    def _snapshot(self, query, args, shift):
+        quoted = re.search(r"\"index\" IN \(([^)]*)\)", query)[1]
+        dates = iter(args or [])
+        rows = []
+        fixings = []
+        for index in re.findall(r"'(\w+)'", quoted):
+            swaps = self.swap_quotes(index, shift)
+            rows.extend(
+                ("swap", index, tenor, None, rate)
+                for tenor, rate in zip(swaps["tenor"], swaps["rate"])
+            )
+            since = None
+            if f'"index"=\'{index}\' AND "date">%s' in query:
+                since = next(dates)
+            fixings.extend(
+                ("fixing", index, None, day, rate)
+                for day, rate in self._fixing_rows(index, since)
+            )
+        # By date, and Postgres sorts the NULL dates of swap quotes last
+        fixings.sort(key=lambda row: row[3])
+        return ["kind", "index", "tenor", "date", "rate"], fixings + rows
+
+    def _swap_rows(self, query, shift):
+        index = _index(query)
+        indices = [index] if index else list(self.swaps)
+        rows = []
+        for quoted in indices:
+            swaps = self.swap_quotes(quoted, shift)
+            rows.extend(
+                ("EURIBOR", quoted, tenor, rate)
+                for tenor, rate in zip(swaps["tenor"], swaps["rate"])
+            )
+        return ["index_name", "index", "tenor", "rate"], rows
+
+    def _fixing_rows(self, index, since=None):
+        rows = self.fixings[index]
+        if since is None:
+            return rows
+        return [row for row in rows if row[0] > since]
+
+
+def _index(query):
+    match = re.search(r"\"index\"='(\w+)'", query)
+    return match and match[1]
+
+
+def _since(query):
+    match = re.search(r"\"date\">'([\d-]+)'", query)
+    return match and date.fromisoformat(match[1])
@@ -1,22 +1,62 @@
-from datetime import datetime
-
+import asyncio
+import contextlib
+import functools
+from collections import defaultdict
+from datetime import date, datetime
+from typing import List, Literal
+
+import numpy as np
 import QuantLib as ql
 from dateutil.relativedelta import relativedelta
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from mangum import Mangum
+from pydantic import BaseModel
 
 from finance import euribor
-from finance.utils import curve_values
+from finance.dates import epoch_days, ql_epoch_days
+from finance.db import close_db_pool
+from finance.executor import run_threaded, shutdown_executors
+from finance.utils import (
+    COMPOUNDINGS,
+    DAY_COUNTERS,
+    FREQUENCIES,
+    curve_values,
+)
+from finance.utils import forward_rates as batch_forward_rates
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    """
+    Build every curve before serving and keep them fresh in the background,
+    so requests find a built curve; close the pool and executors on exit.
+    """
+    await euribor.prewarm()
+    refresher = asyncio.create_task(euribor.refresh_forever())
+    try:
+        yield
+    finally:
+        refresher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await refresher
+        await close_db_pool()
+        shutdown_executors()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/forward_curve")
-async def calculate_forward_curve(index):
+async def calculate_forward_curve(index, horizon="5Y", step="1M"):
 
     curve = await euribor.curve(index)
 
 
-    return curve_values(curve,index)
+    return await run_threaded(curve_values, curve, index, horizon, step)
+
+
+@app.get("/cache_stats")
+async def curve_cache_stats():
+    return euribor.cache_stats()
 
 
 @app.get("/forward_rates")
@@ -28,34 +68,103 @@ async def forward_rates(index):
     # Define a list of dates for January 1st of the next 5 years
     jan_1st_dates = [(datetime.now() + relativedelta(years=i)).replace(month=1, day=1) for i in range(1, 6)]
 
-    # Extract values for these dates and prepare the response
-    forward_values = []
-    for date in jan_1st_dates:
-        rate = curve_forward_rate(curve, date,index)  # Assuming a function to extract the forward rate for a specific date
-        forward_values.append({
-            "time": date,
-            "rate": rate
-        })
-
-    return forward_values
-
-
-def curve_forward_rate(curve, target_date, tenor="1M"):
-    """
-    Calculate the forward rate for a given target date using QuantLib and a specific tenor.
+    # Forward rates over the index tenor, with unadjusted end dates
+    _, rates = await run_threaded(
+        functools.partial(batch_forward_rates, calendar=None),
+        curve,
+        epoch_days(jan_1st_dates),
+        index,
+    )
+    return [
+        {"time": date, "rate": rate}
+        for date, rate in zip(jan_1st_dates, rates.tolist())
+    ]
+
+
+class ForwardRateQuery(BaseModel):
+    index: Literal["1M", "3M", "6M"]
+    start: date
+    tenor: str
+    day_count: Literal[
+        "Actual360", "Actual365Fixed", "Thirty360", "ActualActual"
+    ] = "Actual360"
+    compounding: Literal["Simple", "Continuous", "Compounded"] = "Simple"
+    frequency: Literal[
+        "Annual", "Semiannual", "Quarterly", "Monthly"
+    ] = "Annual"
+
+
+class ForwardRatesRequest(BaseModel):
+    queries: List[ForwardRateQuery]
+
+
+@app.post("/forward_rates")
+async def bulk_forward_rates(request: ForwardRatesRequest):
     """
-    # Convert Python date to QuantLib Date
-    ql_target_date = ql.Date(target_date.day, target_date.month, target_date.year)
-
-    ql_tenor_period =  ql.Period(tenor)
-
-    # Define start and end dates for the forward rate calculation
-    start_date = ql_target_date
-    end_date = ql_target_date + ql_tenor_period  # Use the specified tenor period
+    Evaluate many forward-rate queries in one round trip.
 
-    # Calculate the annualized forward rate
-    forward_rate = curve.forwardRate(start_date, end_date, ql.Actual360(), ql.Simple).rate()
-
-    return forward_rate
-
-handler = Mangum(app)
\ No newline at end of file
+    Every curve is resolved once, queries sharing a curve and conventions
+    are evaluated together in one batch, and results are returned in the
+    order of the queries. End dates are the start dates advanced by the
+    tenor on the TARGET calendar.
+    """
+    queries = request.queries
+    indices = sorted({query.index for query in queries})
+    curves = dict(
+        zip(indices, await asyncio.gather(*map(euribor.curve, indices)))
+    )
+    rates = await run_threaded(_evaluate_queries, queries, curves)
+    return [
+        {"time": query.start, "rate": rate}
+        for query, rate in zip(queries, rates.tolist())
+    ]
+
+
+def _evaluate_queries(queries, curves):
+    groups = defaultdict(list)
+    for position, query in enumerate(queries):
+        key = (
+            query.index,
+            query.tenor,
+            query.day_count,
+            query.compounding,
+            query.frequency,
+        )
+        groups[key].append(position)
+
+    rates = np.empty(len(queries))
+    for (index, tenor, day_count, compounding, frequency), positions in (
+        groups.items()
+    ):
+        try:
+            period = ql.Period(tenor)
+        except RuntimeError:
+            raise HTTPException(422, f"Invalid tenor: {tenor}")
+        if period.length() <= 0:
+            raise HTTPException(422, f"Tenor must be positive: {tenor}")
+        starts = epoch_days([queries[p].start for p in positions])
+        reference = curves[index].referenceDate()
+        if starts.min() < ql_epoch_days([reference])[0]:
+            raise HTTPException(
+                422,
+                f"Start dates of {index} must not be before the curve "
+                f"reference date {reference.ISO()}",
+            )
+        _, group_rates = batch_forward_rates(
+            curves[index],
+            starts,
+            period,
+            DAY_COUNTERS[day_count],
+            COMPOUNDINGS[compounding],
+            FREQUENCIES[frequency],
+        )
+        rates[positions] = group_rates
+    return rates
+
+
+# On Lambda, Mangum would run the lifespan around every invocation, i.e.
+# prewarm every curve and close the pool and executors on each request. The
+# process is frozen between invocations, so there is no refresher either:
+# curves are built on first use and revalidated after CURVE_TTL, and the pool
+# and executors live as long as the container.
+handler = Mangum(app, lifespan="off")
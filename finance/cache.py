@@ -0,0 +1,139 @@
+"""In-process cache for bootstrapped curves."""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class _Entry:
+    __slots__ = ("value", "version", "checked_at")
+
+    def __init__(self, value, version, checked_at):
+        self.value = value
+        self.version = version
+        self.checked_at = checked_at
+
+
+class CurveCache:
+    """
+    Bounded TTL cache that serves stale curves while revalidating them.
+
+    Every entry remembers the data version it was built from. Within ``ttl``
+    seconds an entry is returned without touching the database. Past that
+    the stale curve is still returned immediately, and a background task
+    re-reads the data version and only rebuilds when it has moved.
+
+    Concurrent misses for the same key share a single in-flight build, so a
+    burst of requests costs one round of queries and one bootstrap.
+
+    Parameters:
+    ttl (float): Seconds an entry is served before it is revalidated.
+    maxsize (int): Maximum number of entries, least recently used go first.
+    clock (callable): Monotonic time source, swappable in tests.
+    """
+
+    def __init__(self, ttl=60.0, maxsize=8, clock=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._refreshing = {}
+        self._pending = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "stale": 0,
+            "rebuilds": 0,
+        }
+
+    async def get(self, key, build, version):
+        """
+        Return the cached value for ``key``, building it on a miss.
+
+        Parameters:
+        key (hashable): Cache key, e.g. the Euribor tenor.
+        build (callable): Coroutine function returning a fresh value.
+        version (callable): Coroutine function returning the data version.
+
+        Returns:
+        object: The cached (possibly stale) or freshly built value.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return await self._load_once(key, build, version)
+
+        self._entries.move_to_end(key)
+        if self._clock() - entry.checked_at < self.ttl:
+            self.stats["hits"] += 1
+        else:
+            self.stats["stale"] += 1
+            self._start_revalidation(key, build, version)
+        return entry.value
+
+    async def refresh(self, key, build, version):
+        """
+        Re-read the data version of ``key`` now and rebuild the entry if it
+        moved, or if there is no entry, e.g. from a background task.
+        A revalidation already in flight for ``key`` is shared.
+
+        Parameters:
+        key (hashable): Cache key, e.g. the Euribor tenor.
+        build (callable): Coroutine function returning a fresh value.
+        version (callable): Coroutine function returning the data version.
+        """
+        await asyncio.shield(self._start_revalidation(key, build, version))
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when ``key`` is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _start_revalidation(self, key, build, version):
+        task = self._refreshing.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._revalidate(key, build, version))
+            self._refreshing[key] = task
+        return task
+
+    async def _load_once(self, key, build, version):
+        pending = self._pending.get(key)
+        if pending is None:
+            self.stats["misses"] += 1
+            pending = asyncio.ensure_future(self._load(key, build, version))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded so that a cancelled caller does not cancel the shared build
+        return await asyncio.shield(pending)
+
+    async def _load(self, key, build, version):
+        # Read the version first: if the data moves while we build, the next
+        # revalidation sees a newer version and rebuilds, never the opposite.
+        data_version = await version()
+        value = await build()
+        self._store(key, value, data_version)
+        return value
+
+    async def _revalidate(self, key, build, version):
+        try:
+            data_version = await version()
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == data_version:
+                entry.checked_at = self._clock()
+                return
+            self.stats["rebuilds"] += 1
+            self._store(key, await build(), data_version)
+        except Exception as e:
+            print(f"Error refreshing curve {key}: {str(e)}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _store(self, key, value, data_version):
+        self._entries[key] = _Entry(value, data_version, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -1,6 +1,21 @@
-import QuantLib as ql
 import numpy as np
 import pandas as pd
+from scipy.optimize import minimize
+
+from finance.dates import epoch_days, ql_epoch_days
+from finance.hull_white import (
+    hw_alpha,
+    hw_expectation,
+    hw_expectation_gradient,
+    hw_std,
+    instantaneous_forwards,
+    simulate_short_rates,
+)
+from finance.scenarios import run_scenarios
+from finance.volatility import VolatilitySurface
+
+# Maturities, in years, of the historical volatility surface
+SURFACE_MATURITIES = [1, 2, 5, 10, 15, 20]
 
 
 def calculate_volatility(df):
@@ -13,60 +28,11 @@ def calculate_volatility(df):
     end_date (str): End date for the period (format: 'YYYY-MM-DD'). Default is None (use entire range).
 
     Returns:
-    float: Annualized volatility of the log returns of Euribor fixings.
+    pd.DataFrame: Annualized rolling volatilities of the log returns over
+        1Y to 20Y windows, see ``finance.volatility.VolatilitySurface``.
     """
-    # Sort data by date just to be sure
-    df = df.sort_values(by="date")
-    df = fill_missing_dates(df)
-    # Calculate log returns
-    df["Log Return"] = np.log(df["rate"] / df["rate"].shift(1))
-
-    # Drop NaN values resulting from shift
-    df = df.dropna()
-
-    window_size_1Y = 252  # 1 year (252 trading days)
-    window_size_2Y = 504  # 2 years
-    window_size_5Y = 1260  # 5 years
-    window_size_10Y = 2520  # 10 years
-    window_size_15Y = 3780  # 15 years
-    window_size_20Y = 5040  # 20 years
-
-    # Estimate volatility (annualized) using a rolling window
-    df["Volatility_1Y"] = df["Log Return"].rolling(
-        window=window_size_1Y
-    ).std() * np.sqrt(252)
-    df["Volatility_2Y"] = df["Log Return"].rolling(
-        window=window_size_2Y
-    ).std() * np.sqrt(252)
-    df["Volatility_5Y"] = df["Log Return"].rolling(
-        window=window_size_5Y
-    ).std() * np.sqrt(252)
-    df["Volatility_10Y"] = df["Log Return"].rolling(
-        window=window_size_10Y
-    ).std() * np.sqrt(252)
-    df["Volatility_15Y"] = df["Log Return"].rolling(
-        window=window_size_15Y
-    ).std() * np.sqrt(252)
-    df["Volatility_20Y"] = df["Log Return"].rolling(
-        window=window_size_20Y
-    ).std() * np.sqrt(252)
-    # Drop NaN values after rolling calculations
-    df = df.dropna()
-    # Create a DataFrame to hold the volatility surface
-    volatility_surface = pd.DataFrame(
-        {
-            "Date": df["date"],
-            "1Y Volatility": df["Volatility_1Y"],
-            "2Y Volatility": df["Volatility_2Y"],
-            "5Y Volatility": df["Volatility_5Y"],
-            "10Y Volatility": df["Volatility_10Y"],
-            "15Y Volatility": df["Volatility_15Y"],
-            "20Y Volatility": df["Volatility_20Y"],
-        }
-    )
-    # Drop NaN values
-    volatility_surface = volatility_surface.dropna()
-    return volatility_surface
+    # All windows in one pass over prefix sums of the log returns
+    return VolatilitySurface().update(df)
 
 
 def fill_missing_dates(df):
@@ -86,7 +52,84 @@ def fill_missing_dates(df):
     return df_filled
 
 
-def simulate_hw_paths(hw_model, forward_curve, maturity_years, num_paths=100, num_steps=252):
+def fixings_times(dates, reference_date):
+    """
+    Actual/365 (Fixed) year fractions between fixing dates and a reference
+    date, whichever comes first.
+
+    Parameters:
+    dates (array-like): Fixing dates.
+    reference_date (QuantLib.Date): Reference date of the curve.
+
+    Returns:
+    np.ndarray: Non-negative year fractions.
+    """
+    (reference,) = ql_epoch_days([reference_date])
+    return np.abs(epoch_days(dates) - reference) / 365.0
+
+
+def fixings_error(params, times, rates, forwards, forward0):
+    """
+    Root of the summed squared differences between historical fixings and
+    the expected Hull-White short rate at the same year fractions, with its
+    analytic gradient.
+
+    Parameters:
+    params (list): Hull-White parameters [a, sigma].
+    times (np.ndarray): Year fractions of the fixings (see ``fixings_times``).
+    rates (np.ndarray): Historical fixings, as decimals.
+    forwards (np.ndarray): Instantaneous forwards f(0, t) at ``times``.
+    forward0 (float): Instantaneous forward f(0, 0).
+
+    Returns:
+    tuple: The error and its gradient with respect to [a, sigma].
+    """
+    a, sigma = params
+    residuals = hw_expectation(forwards, forward0, times, a, sigma) - rates
+    error = np.sqrt(np.dot(residuals, residuals))
+    d_a, d_sigma = hw_expectation_gradient(forward0, times, a, sigma)
+    if error == 0:
+        return error, np.zeros(2)
+    gradient = np.array([np.dot(residuals, d_a), np.dot(residuals, d_sigma)])
+    return error, gradient / error
+
+
+def calibrate_to_fixings(
+    forward_curve, fixings_df, initial_guess=(0.03, 0.001)
+):
+    """
+    Fit Hull-White a and sigma to historical fixings with L-BFGS-B.
+
+    Year fractions and forwards are computed once, and every function
+    evaluation is a handful of array operations with an exact gradient.
+
+    Parameters:
+    forward_curve (QuantLib.YieldTermStructure or its Handle): Forward curve.
+    fixings_df (pd.DataFrame): Fixings with 'date' and 'rate' (decimal)
+        columns.
+    initial_guess (tuple): Starting [a, sigma].
+
+    Returns:
+    scipy.optimize.OptimizeResult: Result of the minimisation.
+    """
+    times = fixings_times(fixings_df["date"], forward_curve.referenceDate())
+    rates = fixings_df["rate"].to_numpy(dtype=float)
+    forwards = instantaneous_forwards(forward_curve, times)
+    (forward0,) = instantaneous_forwards(forward_curve, [0.0])
+    return minimize(
+        fixings_error,
+        initial_guess,
+        args=(times, rates, forwards, forward0),
+        jac=True,
+        method="L-BFGS-B",
+        bounds=[(0, None), (0, None)],
+    )
+
+
+def simulate_hw_paths(
+    hw_model, forward_curve, maturity_years, num_paths=100, num_steps=252,
+    seed=None, workers=1,
+):
     """
     Simulate Hull-White paths and estimate model-implied volatility.
 
@@ -96,36 +139,63 @@ def simulate_hw_paths(hw_model, forward_curve, maturity_years, num_paths=100, nu
     maturity_years (int): Maturity for which to simulate paths (1Y, 2Y, etc.).
     num_paths (int): Number of Monte Carlo paths.
     num_steps (int): Number of time steps.
+    seed (int): Seed of the random draws, None for a fresh one.
+    workers (int): Processes to shard the paths across; with more than one,
+        only the terminal rates are sent back from the workers.
 
     Returns:
     float: Model-implied volatility.
     """
-    # Create the Hull-White process
-    hw_process = ql.HullWhiteProcess(forward_curve, hw_model.params()[0], hw_model.params()[1])
-
-    # Time step for the simulation
-    maturity_time = maturity_years
-
-    # Initialize path generator
-    rng = ql.GaussianRandomSequenceGenerator(
-        ql.UniformRandomSequenceGenerator(num_steps, ql.UniformRandomGenerator())
-    )
-    seq = ql.GaussianPathGenerator(hw_process, maturity_time, num_steps, rng, False)
+    a, sigma = hw_model.params()
+    times = np.linspace(0.0, maturity_years, num_steps + 1)
 
     # Simulate paths and collect the final rates
-    paths = []
-    for i in range(num_paths):
-        sample_path = seq.next()
-        path = sample_path.value()
-        paths.append(path[-1])
+    if workers == 1:
+        paths = simulate_short_rates(
+            forward_curve, a, sigma, times, num_paths, seed
+        )[:, -1]
+    else:
+        paths = run_scenarios(
+            forward_curve, a, sigma, times, num_paths, seed, workers,
+            keep_terminal=True,
+        ).terminal
 
     # Estimate the model-implied volatility (standard deviation of log returns)
-    paths = np.array(paths)
     log_returns = np.log(paths[1:] / paths[:-1])
     return np.std(log_returns) * np.sqrt(252)  # Annualized volatility
 
 
-def calibration_error(params, hw_model, forward_curve, volatility_surface):
+def analytic_hw_volatility(a, sigma, forward_curve, maturities):
+    """
+    Closed-form counterpart of ``simulate_hw_paths``.
+
+    The simulated terminal rates r(T) are Gaussian with mean alpha(T) and
+    standard deviation s(T) from the exact Hull-White variance. The log
+    ratios of two independent draws then have a standard deviation of
+    sqrt(2) s(T) / alpha(T) to first order in s(T) / alpha(T), which is what
+    the simulation estimates with Monte Carlo noise. Unlike the simulation it
+    stays finite when some paths turn negative.
+
+    Parameters:
+    a (float): Mean reversion speed.
+    sigma (float): Short-rate volatility.
+    forward_curve (QuantLib.YieldTermStructure, its Handle, or
+        CurveSnapshot): Forward curve for the model.
+    maturities (array-like): Maturities in years.
+
+    Returns:
+    np.ndarray: Model-implied volatility at every maturity.
+    """
+    maturities = np.asarray(maturities, dtype=float)
+    forwards = instantaneous_forwards(forward_curve, maturities)
+    mean = hw_alpha(forwards, maturities, a, sigma)
+    std = hw_std(a, sigma, maturities)
+    return np.sqrt(2 * 252) * std / np.abs(mean)
+
+
+def calibration_error(
+    params, hw_model, forward_curve, volatility_surface, method="simulation"
+):
     """
     Objective function to minimize during calibration. Compares historical volatilities
     with model-implied volatilities for different maturities.
@@ -135,6 +205,9 @@ def calibration_error(params, hw_model, forward_curve, volatility_surface):
     hw_model (QuantLib.HullWhite): Hull-White model.
     forward_curve (QuantLib.YieldTermStructureHandle): Forward curve.
     volatility_surface (pd.DataFrame): Historical volatility surface.
+    method (str): "simulation" for ``simulate_hw_paths``, or "analytic"
+        for the closed-form model volatility of ``analytic_hw_volatility``
+        (deterministic and smooth, within a few percent of simulation).
 
     Returns:
     float: Sum of squared errors between historical and model-implied volatilities.
@@ -142,11 +215,24 @@ def calibration_error(params, hw_model, forward_curve, volatility_surface):
     a, sigma = params
     hw_model.setParams([a, sigma])  # Update Hull-White parameters
 
-    error = 0
-    # Loop over each maturity in the volatility surface
-    for maturity_years in [1, 2, 5, 10, 15, 20]:
-        historical_vol = volatility_surface[f'{maturity_years}Y Volatility'].mean()  # Average historical vol
-        model_vol = simulate_hw_paths(hw_model, forward_curve, maturity_years)  # Model-implied vol
-        error += (historical_vol - model_vol) ** 2  # Sum of squared errors
-
-    return error
+    historical_vols = np.array(
+        [
+            volatility_surface[f"{maturity_years}Y Volatility"].mean()
+            for maturity_years in SURFACE_MATURITIES
+        ]
+    )
+    if method == "analytic":
+        model_vols = analytic_hw_volatility(
+            a, sigma, forward_curve, SURFACE_MATURITIES
+        )
+    elif method == "simulation":
+        model_vols = np.array(
+            [
+                simulate_hw_paths(hw_model, forward_curve, maturity_years)
+                for maturity_years in SURFACE_MATURITIES
+            ]
+        )
+    else:
+        raise ValueError(f"Unsupported calibration method: {method}")
+
+    return np.sum((historical_vols - model_vols) ** 2)
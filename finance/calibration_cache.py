@@ -0,0 +1,144 @@
+"""On-disk cache of calibrated Hull-White parameters."""
+
+import contextlib
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from finance.calibrate import calibrate_to_fixings
+from finance.dates import epoch_days, ql_epoch_days
+from finance.market_cache import default_cache_dir
+
+# Directory of the calibration files
+CACHE_DIR = os.environ.get("FINANCE_CACHE_DIR") or default_cache_dir()
+# Largest relative change in the number of fixings that still warm-starts
+# the optimizer from the previous solution
+WARM_START_CHANGE = 0.05
+
+
+def calibration_key(forward_curve, fixings_df):
+    """
+    Hash of the calibration inputs: the fixings window and the curve nodes.
+
+    Parameters:
+    forward_curve (QuantLib.PiecewiseLogCubicDiscount): Bootstrapped curve.
+    fixings_df (pd.DataFrame): Fixings with 'date' and 'rate' columns.
+
+    Returns:
+    str: Hex digest identifying the inputs.
+    """
+    digest = hashlib.sha256()
+    digest.update(epoch_days(fixings_df["date"]).tobytes())
+    digest.update(fixings_df["rate"].to_numpy(dtype=float).tobytes())
+    dates, values = zip(*forward_curve.nodes())
+    digest.update(ql_epoch_days(dates).tobytes())
+    digest.update(np.array(values, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class CalibrationCache:
+    """
+    Persist calibrated (a, sigma) per index, keyed on a hash of the inputs.
+
+    When the fixings and the curve are unchanged the stored parameters are
+    returned without optimizing. When the fixings window starts on the same
+    date and its length moved by at most ``WARM_START_CHANGE``, calibration
+    starts from the stored solution instead of the default guess.
+
+    The cache is best-effort: files that cannot be read or written are
+    reported and the calibration runs as if nothing were cached.
+
+    Parameters:
+    directory (str): Directory holding one JSON file per index.
+    """
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "warm_starts": 0,
+            "iterations": 0,
+            "last_iterations": 0,
+        }
+
+    def calibrate(
+        self, name, forward_curve, fixings_df, initial_guess=(0.03, 0.001)
+    ):
+        """
+        Calibrated Hull-White parameters for ``name``, from the cache when
+        possible.
+
+        Parameters:
+        name (str): Name of the calibration, e.g. "EURIBOR6M".
+        forward_curve (QuantLib.PiecewiseLogCubicDiscount): Forward curve.
+        fixings_df (pd.DataFrame): Fixings with 'date' and 'rate' (decimal)
+            columns.
+        initial_guess (tuple): Starting [a, sigma] of a cold calibration.
+
+        Returns:
+        tuple: Calibrated (a, sigma).
+        """
+        key = calibration_key(forward_curve, fixings_df)
+        entry = self._read(name)
+        if entry is not None and entry["key"] == key:
+            self.stats["hits"] += 1
+            self.stats["last_iterations"] = 0
+            return entry["a"], entry["sigma"]
+
+        self.stats["misses"] += 1
+        first_day = int(epoch_days(fixings_df["date"].iloc[:1])[0])
+        if self._can_warm_start(entry, first_day, len(fixings_df)):
+            self.stats["warm_starts"] += 1
+            initial_guess = (entry["a"], entry["sigma"])
+        result = calibrate_to_fixings(forward_curve, fixings_df, initial_guess)
+        self.stats["iterations"] += int(result.nit)
+        self.stats["last_iterations"] = int(result.nit)
+
+        a, sigma = (float(x) for x in result.x)
+        self._write(
+            name,
+            {
+                "key": key,
+                "a": a,
+                "sigma": sigma,
+                "first_day": first_day,
+                "num_fixings": len(fixings_df),
+                "iterations": int(result.nit),
+            },
+        )
+        return a, sigma
+
+    def _can_warm_start(self, entry, first_day, num_fixings):
+        if entry is None or entry["first_day"] != first_day:
+            return False
+        change = abs(num_fixings - entry["num_fixings"])
+        return change <= WARM_START_CHANGE * entry["num_fixings"]
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"calibration_{name}.json")
+
+    def _read(self, name):
+        try:
+            with open(self._path(name)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            print(f"Ignoring unreadable calibration cache for {name}: {e}")
+            return None
+
+    def _write(self, name, entry):
+        path = self._path(name)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "w") as f:
+                json.dump(entry, f)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Error writing calibration cache {path}: {str(e)}")
+            with contextlib.suppress(OSError):
+                os.remove(temporary)
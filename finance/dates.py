@@ -0,0 +1,189 @@
+"""Vectorized calendar helpers working on int64 days since 1970-01-01."""
+
+from datetime import date
+
+import numpy as np
+import QuantLib as ql
+
+# QuantLib serial number of 1970-01-01, the origin of numpy day ordinals
+EPOCH_SERIAL = 25569
+# date.toordinal() of 1970-01-01
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+BUSINESS_DAYS_UNTIL = ql.Date(31, 12, 2100)
+_business_days = {}
+_following = {}
+_ACTUAL_BASIS = {"Actual/360": 360.0, "Actual/365 (Fixed)": 365.0}
+
+
+def epoch_days(dates):
+    """
+    Convert a column of dates to int64 days since 1970-01-01.
+
+    Accepts datetime64 arrays, pandas columns, and sequences of dates,
+    datetimes (the time of day is dropped) or ISO strings.
+    """
+    values = np.asarray(dates)
+    if (
+        values.dtype == object
+        and values.size
+        and isinstance(values.flat[0], date)
+    ):
+        # NumPy parses date objects one by one, ordinals are ~10x faster
+        days = np.fromiter(
+            (day.toordinal() for day in values.flat), np.int64, values.size
+        )
+        return days.reshape(values.shape) - EPOCH_ORDINAL
+    return (
+        values.astype("datetime64[us]")
+        .astype("datetime64[D]")
+        .astype(np.int64)
+    )
+
+
+def ql_epoch_days(dates):
+    """Convert an iterable of ``ql.Date`` to int64 days since 1970-01-01."""
+    return np.array([d.serialNumber() for d in dates], dtype=np.int64) - (
+        EPOCH_SERIAL
+    )
+
+
+def business_day_table(calendar):
+    """
+    Business days of ``calendar`` indexed by days since 1970-01-01.
+
+    Computed once per calendar up to 2100. Returns a boolean mask and an
+    object array holding the matching ``ql.Date`` for every business day,
+    so fixings can be filtered and converted by fancy indexing.
+    """
+    table = _business_days.get(calendar.name())
+    if table is None:
+        business_days = calendar.businessDayList(
+            ql.Date(EPOCH_SERIAL), BUSINESS_DAYS_UNTIL
+        )
+        size = BUSINESS_DAYS_UNTIL.serialNumber() - EPOCH_SERIAL + 1
+        ordinals = [d.serialNumber() - EPOCH_SERIAL for d in business_days]
+        mask = np.zeros(size, dtype=bool)
+        mask[ordinals] = True
+        dates = np.empty(size, dtype=object)
+        dates[ordinals] = business_days
+        table = _business_days[calendar.name()] = (mask, dates)
+    return table
+
+
+def ql_dates(calendar, days):
+    """``ql.Date`` objects for business days given as days since 1970."""
+    _, dates = business_day_table(calendar)
+    inside = (days >= 0) & (days < len(dates))
+    if inside.all():
+        return dates[days].tolist()
+    return [ql.Date(int(day) + EPOCH_SERIAL) for day in days]
+
+
+def is_business_day(calendar, days):
+    """Vectorized ``calendar.isBusinessDay`` over days since 1970-01-01."""
+    mask, _ = business_day_table(calendar)
+    inside = (days >= 0) & (days < len(mask))
+    business = np.zeros(len(days), dtype=bool)
+    business[inside] = mask[days[inside]]
+    # Dates outside the precomputed range are rare; ask the calendar directly
+    for i in np.flatnonzero(~inside):
+        date = ql.Date(int(days[i]) + EPOCH_SERIAL)
+        business[i] = calendar.isBusinessDay(date)
+    return business
+
+
+def adjust_following(calendar, days):
+    """Vectorized ``calendar.adjust(date, ql.Following)``."""
+    following = _following.get(calendar.name())
+    if following is None:
+        mask, _ = business_day_table(calendar)
+        ordinals = np.where(mask, np.arange(len(mask)), len(mask))
+        following = np.minimum.accumulate(ordinals[::-1])[::-1]
+        following = _following[calendar.name()] = following
+    if ((days >= 0) & (days < len(following))).all():
+        adjusted = following[days]
+        if (adjusted < len(following)).all():
+            return adjusted
+    return np.array(
+        [
+            calendar.adjust(ql.Date(int(day) + EPOCH_SERIAL)).serialNumber()
+            - EPOCH_SERIAL
+            for day in days
+        ],
+        dtype=np.int64,
+    )
+
+
+def add_period(days, period, multiples=1):
+    """
+    Add ``multiples`` times a ``ql.Period`` to days since 1970-01-01 without
+    any adjustment, like ``date + period`` does for ``ql.Date``.
+    """
+    length, units = period.length() * np.asarray(multiples), period.units()
+    if units == ql.Days:
+        return days + length
+    if units == ql.Weeks:
+        return days + 7 * length
+    months = length * 12 if units == ql.Years else length
+    dates = np.asarray(days).astype("datetime64[D]")
+    month = dates.astype("datetime64[M]")
+    day_of_month = (dates - month.astype("datetime64[D]")).astype(np.int64)
+    target = month + months
+    month_length = (
+        (target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")
+    ).astype(np.int64)
+    shifted = target.astype("datetime64[D]") + np.minimum(
+        day_of_month, month_length - 1
+    )
+    return shifted.astype(np.int64)
+
+
+def schedule(start, end, step):
+    """
+    Days of ``ql.MakeSchedule(start, end, step)``. Like QuantLib's default
+    backward rule this is ``start`` followed by ``end - i * step`` for every
+    such date after ``start``.
+    """
+    if step.units() == ql.Weeks:
+        # QuantLib has its own rules for weekly schedules, defer to it
+        return ql_epoch_days(ql.MakeSchedule(start, end, step))
+    first, last = ql_epoch_days([start, end])
+    shortest = {ql.Days: 1, ql.Months: 28, ql.Years: 365}
+    count = (last - first) // (shortest[step.units()] * step.length()) + 2
+    days = add_period(np.int64(last), step, -np.arange(count))[::-1]
+    return np.insert(days[days > first], 0, first)
+
+
+def advance(calendar, days, period):
+    """
+    Vectorized ``calendar.advance(date, period)`` with the default Following
+    convention. Day periods count business days, so they fall back to
+    QuantLib; month and year periods are computed on the arrays.
+    """
+    if period.units() == ql.Days:
+        return np.array(
+            [
+                calendar.advance(
+                    ql.Date(int(day) + EPOCH_SERIAL), period
+                ).serialNumber()
+                - EPOCH_SERIAL
+                for day in days
+            ],
+            dtype=np.int64,
+        )
+    return adjust_following(calendar, add_period(days, period))
+
+
+def year_fractions(day_counter, start, end):
+    """Vectorized ``day_counter.yearFraction(start, end)``."""
+    basis = _ACTUAL_BASIS.get(day_counter.name())
+    if basis is not None:
+        return (end - start) / basis
+    return np.array(
+        [
+            day_counter.yearFraction(
+                ql.Date(int(s) + EPOCH_SERIAL), ql.Date(int(e) + EPOCH_SERIAL)
+            )
+            for s, e in zip(start, end)
+        ]
+    )
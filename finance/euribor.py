@@ -1,10 +1,124 @@
+import asyncio
+import os
+
+import QuantLib as ql
+
 from finance import euribor_1m, euribor_3m, euribor_6m
+from finance.cache import CurveCache
+from finance.market_data import load_snapshot
+from finance.snapshot import CurveSnapshot
+
+# Seconds a bootstrapped curve is served before its data version is checked
+CURVE_TTL = float(os.environ.get("CURVE_TTL", 60))
+CURVE_CACHE_SIZE = int(os.environ.get("CURVE_CACHE_SIZE", 8))
+# Seconds between background checks of the data versions; below CURVE_TTL
+# requests always find a fresh curve
+CURVE_REFRESH_INTERVAL = float(os.environ.get("CURVE_REFRESH_INTERVAL", 30))
+
+_builders = {
+    "1M": euribor_1m.curve,
+    "3M": euribor_3m.curve,
+    "6M": euribor_6m.curve,
+}
+_fixings_loaders = {
+    "1M": euribor_1m.load_fixings,
+    "3M": euribor_3m.load_fixings,
+    "6M": euribor_6m.load_fixings,
+}
+_cache = CurveCache(ttl=CURVE_TTL, maxsize=CURVE_CACHE_SIZE)
+# Market snapshot being loaded, and the latest one loaded
+_snapshots = {"loading": None, "latest": None}
 
 
 async def curve(index):
-    if index == "1M":
-        return await euribor_1m.curve()
-    elif index == "3M":
-        return await euribor_3m.curve()
-    elif index == "6M":
-        return await euribor_6m.curve()
\ No newline at end of file
+    if index not in _builders:
+        return None
+    return await _cache.get(
+        index, lambda: build(index), lambda: data_version(index)
+    )
+
+
+async def build(index):
+    """Bootstrap the curve for ``index`` from the latest market snapshot."""
+    snapshot = _snapshots["latest"] or await market_snapshot()
+    return await _builders[index](snapshot)
+
+
+async def market_snapshot():
+    """
+    Load a snapshot of the market data of every index in one query.
+    Concurrent callers, e.g. the version checks of all the curves, share a
+    single load, so the curves rebuilt together see the same data.
+    """
+    loading = _snapshots["loading"]
+    if loading is None:
+        loading = asyncio.ensure_future(_load_snapshot())
+        _snapshots["loading"] = loading
+        loading.add_done_callback(
+            lambda _: _snapshots.update(loading=None)
+        )
+    return await asyncio.shield(loading)
+
+
+async def _load_snapshot():
+    snapshot = await load_snapshot("EURIBOR", list(_builders))
+    # Fixings of every index are pushed at once, so that the next snapshot
+    # only reads newer ones even for curves that are not rebuilt
+    for load_fixings in _fixings_loaders.values():
+        load_fixings(snapshot)
+    _snapshots["latest"] = snapshot
+    return snapshot
+
+
+async def prewarm():
+    """
+    Build every curve concurrently, e.g. at startup. Failures are reported
+    and left to the background refresh.
+    """
+    indices = list(_builders)
+    results = await asyncio.gather(
+        *map(curve, indices), return_exceptions=True
+    )
+    for index, result in zip(indices, results):
+        if isinstance(result, Exception):
+            print(f"Error building curve {index}: {str(result)}")
+
+
+async def refresh(index):
+    """Rebuild the curve for ``index`` if its market data has changed."""
+    await _cache.refresh(
+        index, lambda: build(index), lambda: data_version(index)
+    )
+
+
+async def refresh_forever(interval=None):
+    """
+    Check the data version of every curve each ``interval`` seconds
+    (default ``CURVE_REFRESH_INTERVAL``) and rebuild the curves whose data
+    has changed, until cancelled.
+    """
+    interval = interval or CURVE_REFRESH_INTERVAL
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.gather(*map(refresh, _builders))
+
+
+async def snapshot(index, horizon=None, step_days=1):
+    """Export the curve for ``index`` into an array-backed CurveSnapshot."""
+    return CurveSnapshot.from_curve(await curve(index), horizon, step_days)
+
+
+async def data_version(index):
+    """
+    Identify the market data a curve for ``index`` would be built from: the
+    real-time swap quotes and the date of the latest stored fixing, read
+    from a fresh market snapshot, and the evaluation date the curve is
+    anchored at.
+    """
+    evaluation_date = ql.Settings.instance().evaluationDate.serialNumber()
+    return (await market_snapshot()).version(index), evaluation_date
+
+
+def cache_stats():
+    """Hit, miss, stale and rebuild counters of the curve cache."""
+    return dict(_cache.stats)
@@ -1,50 +1,28 @@
-import asyncio
-
 import QuantLib as ql
 
-from finance.fixings import apply_fixings
-from finance.utils import get_swap_rate, get_ql_quotes_periods
+from finance.fixings import fixings_store
+from finance.live_curve import LiveCurve, bootstrap
+from finance.market_data import load_snapshot
 
+_curve = LiveCurve(ql.Euribor1M(), ql.Period(1, ql.Months))
 
-async def curve():
-    calendar = ql.TARGET()
-    deposit_rate = ql.Euribor1M()
-    data, historical_fixings = await asyncio.gather(
-        get_swap_rate("EURIBOR", "1M"),
-        apply_fixings("1M", calendar, deposit_rate, "EURIBOR"),
-    )
-    print(data)
-    rate = historical_fixings
-    helpers = []
 
-    helpers.append(
-        ql.DepositRateHelper(
-            ql.QuoteHandle(ql.SimpleQuote(rate / 100)),
-            ql.Period(1,ql.Months),
-            2,
-            calendar,
-            ql.Following,
-            False,
-            ql.Actual360(),
-        )
+def load_fixings(snapshot):
+    """
+    Push the new 1M fixings of ``snapshot`` into the index and return the
+    latest rate.
+    """
+    return fixings_store("1M", "EURIBOR").apply(
+        _curve.calendar, _curve.deposit_rate, snapshot.fixings["1M"]
     )
-    # Create helpers for each tenor
-    for ql_quote_handle, ql_period in get_ql_quotes_periods(data):
-        helper = ql.SwapRateHelper(
-            ql_quote_handle,
-            ql_period,
-            calendar,
-            ql.Annual,
-            ql.Unadjusted,
-            ql.Thirty360(ql.Thirty360.BondBasis),
-            deposit_rate,
-            ql.QuoteHandle(),
-            ql.Period(0, ql.Days),
-        )
 
-        helpers.append(helper)
-    curve = ql.PiecewiseLogCubicDiscount(
-        0, calendar, helpers, ql.Actual365Fixed()
-    )
-    curve.enableExtrapolation()
-    return curve
+
+async def curve(snapshot=None):
+    """
+    Bootstrap the 1M Euribor curve from ``snapshot``, or from a snapshot of
+    this index alone when None.
+    """
+    if snapshot is None:
+        snapshot = await load_snapshot("EURIBOR", ["1M"])
+    rate = load_fixings(snapshot)
+    return await bootstrap(_curve, snapshot.swaps["1M"], rate)
@@ -0,0 +1,65 @@
+"""Executors that keep CPU-bound QuantLib work off the event loop."""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Where curve bootstraps run: "thread", "process" or "inline" (on the event
+# loop). QuantLib holds the GIL while it computes, so only "process" lets
+# other requests proceed during a bootstrap.
+EXECUTOR = os.environ.get("FINANCE_EXECUTOR", "thread")
+EXECUTOR_WORKERS = int(
+    os.environ.get("FINANCE_EXECUTOR_WORKERS", min(4, os.cpu_count() or 1))
+)
+
+_executors = {}
+
+
+def get_executor(kind):
+    """The shared thread or process pool, created on first use."""
+    pool = _executors.get(kind)
+    if pool is None:
+        if kind == "thread":
+            pool = ThreadPoolExecutor(EXECUTOR_WORKERS, "finance-cpu")
+        elif kind == "process":
+            pool = ProcessPoolExecutor(EXECUTOR_WORKERS)
+        else:
+            raise ValueError(f"Unsupported executor: {kind}")
+        _executors[kind] = pool
+    return pool
+
+
+async def run_cpu(func, *args, kind=None):
+    """
+    Run ``func(*args)`` in the configured executor and await its result.
+
+    Parameters:
+    func (callable): The function; in "process" mode it, its arguments and
+        its result must pickle, which QuantLib objects do not.
+    kind (str): Overrides ``EXECUTOR`` for this call.
+
+    Returns:
+    object: What ``func`` returned.
+    """
+    kind = kind or EXECUTOR
+    if kind == "inline":
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(kind), functools.partial(func, *args)
+    )
+
+
+async def run_threaded(func, *args):
+    """Run ``func(*args)`` on the thread pool, unless running inline."""
+    return await run_cpu(
+        func, *args, kind="inline" if EXECUTOR == "inline" else "thread"
+    )
+
+
+def shutdown_executors():
+    """Shut down the pools created so far."""
+    for pool in _executors.values():
+        pool.shutdown(wait=True)
+    _executors.clear()
@@ -1,11 +1,62 @@
-import QuantLib as ql
+import asyncio
+
+import numpy as np
 from pypika import Order, Query, Table
 
-from finance.db import query_db
+from finance import market_cache
+from finance.dates import epoch_days, is_business_day, ql_dates
+from finance.db import fetch_columns, query_db
+
+# Types of the columns of fixings read as arrays
+FIXING_DTYPES = {"date": "datetime64[D]", "rate": float}
 
 
 async def get_fixings(
     index_name, index=None, tenor=None, up_to=None, starting_at=None
+):
+    if tenor:
+        query = fixings_query(index_name, index, tenor, up_to, starting_at)
+        return await query_db(str(query))
+    # Imported here to keep pandas off the import path of the API
+    import pandas as pd
+
+    fixings = await get_fixing_columns(index_name, index, starting_at)
+    if up_to:
+        kept = fixings["date"] <= np.datetime64(up_to, "D")
+        fixings = {column: values[kept] for column, values in fixings.items()}
+    return pd.DataFrame(fixings)
+
+
+async def get_fixing_columns(index_name, index=None, starting_at=None):
+    """
+    Fixings of an index as NumPy arrays, without building a DataFrame.
+
+    On a full load the on-disk market cache is read first and only newer
+    fixings are queried; fetched fixings are appended to it. Offline only
+    the cache is read.
+
+    Returns:
+    dict: 'date' (datetime64[D]) and 'rate' (float, percent) arrays, in
+        date order.
+    """
+    cached = None
+    if starting_at is None or market_cache.OFFLINE:
+        cached = market_cache.read_fixings(index_name, index)
+    if market_cache.OFFLINE:
+        if cached is None:
+            raise ValueError(f"No cached fixings for {index_name} {index}")
+        fetched = {"date": cached["date"][:0], "rate": cached["rate"][:0]}
+    else:
+        since = market_cache.fixings_since(cached, starting_at)
+        query = fixings_query(index_name, index, starting_at=since)
+        fetched = await fetch_columns(str(query), dtypes=FIXING_DTYPES)
+    return market_cache.update_fixings(
+        index_name, index, cached, fetched, starting_at
+    )
+
+
+def fixings_query(
+    index_name, index=None, tenor=None, up_to=None, starting_at=None
 ):
     table = Table("taxa_fixa_fixings_historical")
     query = (
@@ -21,33 +72,103 @@ async def get_fixings(
         query = query.where(table.date <= up_to)
     if starting_at:
         query = query.where(table.date > starting_at)
-    query = query.orderby(table.date, order=Order.asc)
-    return await query_db(str(query))
+    return query.orderby(table.date, order=Order.asc)
+
+
+class FixingsStore:
+    """
+    Tracks which fixings of one index were already pushed into QuantLib.
+
+    QuantLib keeps index fixings in a process-wide registry, so once a row
+    has been added it does not need to be fetched or added again. Each load
+    only queries rows newer than the last loaded date and appends those;
+    fixings fetched by a market snapshot are applied the same way.
+    """
+
+    def __init__(self, index_name, index):
+        self.index_name = index_name
+        self.index = index
+        self.last_date = None
+        self.last_rate = None
+        self._lock = asyncio.Lock()
+
+    async def load(self, calendar, deposit_rate):
+        """Fetch and add new fixings, returning the latest rate."""
+        async with self._lock:
+            fixings = await get_fixing_columns(
+                self.index_name, self.index, starting_at=self.last_date
+            )
+            return self.apply(calendar, deposit_rate, fixings)
+
+    def apply(self, calendar, deposit_rate, fixings):
+        """
+        Add fixings read elsewhere, e.g. in a market snapshot, skipping the
+        ones already loaded, and return the latest rate.
+
+        Parameters:
+        calendar (QuantLib.Calendar): Calendar of the index.
+        deposit_rate (QuantLib.IborIndex): Index receiving the fixings.
+        fixings (dict): 'date' (datetime64[D]) and 'rate' (percent) arrays,
+            in date order.
+
+        Returns:
+        float: Latest business-day rate in percent, or None.
+        """
+        dates = fixings["date"]
+        if self.last_date is not None:
+            newer = dates > np.datetime64(self.last_date, "D")
+            fixings = {"date": dates[newer], "rate": fixings["rate"][newer]}
+        if len(fixings["date"]):
+            last_rate = add_fixings_to_curve(calendar, deposit_rate, fixings)
+            if last_rate is not None:
+                self.last_rate = last_rate
+            self.last_date = fixings["date"][-1].item()
+        return self.last_rate
+
+    def reset(self):
+        """Forget what was loaded, e.g. after clearing QuantLib histories."""
+        self.last_date = None
+        self.last_rate = None
+
+
+_stores = {}
+
+
+def fixings_store(index, index_name=None):
+    key = (index_name, index)
+    if key not in _stores:
+        _stores[key] = FixingsStore(index_name, index)
+    return _stores[key]
 
 
 async def apply_fixings(index, calendar, deposit_rate, index_name=None):
-    fixings = await get_fixings(index_name, index)
-    return add_fixings_to_curve(calendar, deposit_rate, fixings)
+    return await fixings_store(index, index_name).load(calendar, deposit_rate)
 
 
 def add_fixings_to_curve(calendar, deposit_rate, all_fixings):
-    # Iterate over each fixing
-    fixing_dates = []
-    fixing_rates = []
-    last_rate = None
-    fixings = all_fixings.to_dict(orient="records")
-    for row in fixings:
-        date = row["date"]
-        rate = row["rate"]
-        date_ql = ql.Date(date.day, date.month, date.year)
-        if calendar.isBusinessDay(date_ql):
-            last_rate = rate
-            fixing_dates.append(date_ql)
-            fixing_rates.append(rate / 100)
+    """
+    Add the business-day fixings of a DataFrame, or of 'date' and 'rate'
+    arrays, to a QuantLib index.
+
+    Dates are filtered against a precomputed business-day table and
+    converted in one vectorized step instead of row by row.
+
+    Returns:
+    float: Latest business-day rate (in percent), or None if there is none.
+    """
+    if len(all_fixings) == 0:
+        return None
+    days = epoch_days(all_fixings["date"])
+    business = is_business_day(calendar, days)
+    days = days[business]
+    rates = np.asarray(all_fixings["rate"], dtype=float)[business]
+    if len(days) == 0:
+        return None
+    fixing_dates = ql_dates(calendar, days)
     try:
         deposit_rate.addFixings(
-            fixing_dates, fixing_rates, forceOverwrite=True
+            fixing_dates, (rates / 100).tolist(), forceOverwrite=True
         )
     except Exception as e:
         print(f"Error adding bulk fixings: {str(e)}")
-    return  last_rate
+    return float(rates[-1])
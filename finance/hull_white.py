@@ -0,0 +1,248 @@
+"""Vectorized Hull-White short-rate simulation."""
+
+import warnings
+from collections import deque
+
+import numpy as np
+import QuantLib as ql
+from scipy.stats import norm, qmc
+
+from finance.snapshot import CurveSnapshot
+
+# Above this value of a * t the cumulative-sum scheme would overflow
+_MAX_DECAY_EXPONENT = 500.0
+
+
+def instantaneous_forwards(curve, times):
+    """
+    Instantaneous forward rates f(0, t) of a curve at the given times.
+
+    Parameters:
+    curve (QuantLib.YieldTermStructure, its Handle, or CurveSnapshot): Curve.
+    times (np.ndarray): Times in the curve's day count.
+
+    Returns:
+    np.ndarray: Continuously compounded instantaneous forwards.
+    """
+    times = np.asarray(times, dtype=float)
+    if isinstance(curve, CurveSnapshot):
+        return curve.instantaneous_forward(times)
+    return np.array(
+        [
+            curve.forwardRate(t, t, ql.Continuous, ql.NoFrequency, True).rate()
+            for t in times
+        ]
+    )
+
+
+def hw_alpha(forwards, times, a, sigma):
+    """
+    Deterministic part of the Hull-White short rate fitted to the curve,
+    alpha(t) = f(0, t) + sigma^2 / (2 a^2) (1 - exp(-a t))^2.
+    """
+    times = np.asarray(times, dtype=float)
+    if a > 1e-12:
+        convexity = sigma**2 / (2 * a**2) * np.expm1(-a * times) ** 2
+    else:
+        convexity = 0.5 * sigma**2 * times**2
+    return forwards + convexity
+
+
+def hw_std(a, sigma, dt):
+    """Standard deviation of the exact Hull-White step over ``dt``."""
+    if a > 1e-12:
+        return sigma * np.sqrt(-np.expm1(-2 * a * dt) / (2 * a))
+    return sigma * np.sqrt(dt)
+
+
+def hw_expectation(forwards, forward0, times, a, sigma):
+    """
+    Expected Hull-White short rate E[r(t)] = alpha(t) - f(0, 0) exp(-a t),
+    as given by ``QuantLib.HullWhiteProcess.expectation(0, 0, t)``.
+
+    Parameters:
+    forwards (np.ndarray): Instantaneous forwards f(0, t) at ``times``.
+    forward0 (float): Instantaneous forward f(0, 0).
+    times (np.ndarray): Times in years.
+    a (float): Mean reversion speed.
+    sigma (float): Short-rate volatility.
+
+    Returns:
+    np.ndarray: Expected short rates.
+    """
+    times = np.asarray(times, dtype=float)
+    alpha = hw_alpha(forwards, times, a, sigma)
+    return alpha - forward0 * np.exp(-a * times)
+
+
+def hw_expectation_gradient(forward0, times, a, sigma):
+    """
+    Partial derivatives of ``hw_expectation`` with respect to a and sigma.
+
+    Returns:
+    tuple: (dE/da, dE/dsigma) arrays over ``times``.
+    """
+    times = np.asarray(times, dtype=float)
+    decay = np.exp(-a * times)
+    if a > 1e-8:
+        growth = -np.expm1(-a * times)  # 1 - exp(-a t)
+        d_sigma = sigma / a**2 * growth**2
+        d_convexity = sigma**2 * growth / a**2 * (times * decay - growth / a)
+    else:
+        # Series in a of sigma^2 / (2 a^2) (1 - exp(-a t))^2
+        d_sigma = sigma * times**2 * (1 - a * times)
+        d_convexity = sigma**2 / 2 * (-(times**3) + 7 / 6 * a * times**4)
+    return d_convexity + forward0 * times * decay, d_sigma
+
+
+def simulate_short_rates(
+    curve,
+    a,
+    sigma,
+    times,
+    num_paths,
+    seed=None,
+    antithetic=False,
+    dtype=np.float64,
+    normals=None,
+):
+    """
+    Simulate Hull-White short-rate paths on a time grid in one go.
+
+    Uses the exact discretisation r(t) = alpha(t) + x(t), where x is the
+    Ornstein-Uhlenbeck factor started at zero. Writing the exact recursion
+    x[i+1] = exp(-a dt) x[i] + std[i] Z[i] as a weighted cumulative sum lets
+    the whole (paths x steps) matrix be produced by array operations.
+
+    Parameters:
+    curve (QuantLib.YieldTermStructure, its Handle, or CurveSnapshot): Curve
+        the model is fitted to.
+    a (float): Mean reversion speed.
+    sigma (float): Short-rate volatility.
+    times (array-like): Increasing time grid starting at 0, in years.
+    num_paths (int): Number of paths.
+    seed (int or np.random.Generator): Seed of the normal draws.
+    antithetic (bool): Pair every path with its mirrored path.
+    dtype (np.dtype): Floating type of the returned matrix.
+    normals (np.ndarray): Optional (paths x steps) standard normals to use
+        instead of drawing them, e.g. from a quasi-random sequence.
+
+    Returns:
+    np.ndarray: Short rates of shape (num_paths, len(times)).
+    """
+    times = np.asarray(times, dtype=float)
+    if normals is None:
+        normals = standard_normals(num_paths, len(times) - 1, seed, antithetic)
+    forwards = instantaneous_forwards(curve, times)
+    return short_rate_paths(forwards, times, a, sigma, normals, dtype)
+
+
+def short_rate_paths(forwards, times, a, sigma, normals, dtype=np.float64):
+    """
+    Hull-White short-rate paths from precomputed forwards f(0, t).
+
+    This is the part of ``simulate_short_rates`` that only needs arrays, so
+    it can run in worker processes where the QuantLib curve is unavailable.
+    """
+    paths = ou_paths(a, sigma, times, normals)
+    paths += hw_alpha(forwards, times, a, sigma)
+    return paths.astype(dtype, copy=False)
+
+
+def standard_normals(num_paths, num_steps, seed=None, antithetic=False):
+    """Pseudo-random (paths x steps) standard normals, optionally mirrored."""
+    rng = np.random.default_rng(seed)
+    if not antithetic:
+        return rng.standard_normal((num_paths, num_steps))
+    half = rng.standard_normal(((num_paths + 1) // 2, num_steps))
+    return np.concatenate([half, -half])[:num_paths]
+
+
+def sobol_normals(num_paths, times, seed=None, skip=0):
+    """
+    Quasi-random (paths x steps) standard normals for a time grid.
+
+    Points of a scrambled Sobol sequence are mapped to normals and laid out
+    by Brownian-bridge construction: the first dimensions fix the end point
+    and the successive midpoints of the path, where low-discrepancy
+    coordinates matter most, and the rest fill in the fine detail. The
+    result is returned as the standardised increments of that Brownian
+    motion, so it can be passed as ``normals`` to ``simulate_short_rates``.
+
+    Parameters:
+    num_paths (int): Number of paths; powers of two balance best.
+    times (array-like): Increasing time grid starting at 0, in years.
+    seed (int): Seed of the scrambling; the same seed gives the same
+        sequence, so consecutive blocks can be drawn with ``skip``.
+    skip (int): Number of sequence points to skip.
+
+    Returns:
+    np.ndarray: Standard normals of shape (num_paths, len(times) - 1).
+    """
+    times = np.asarray(times, dtype=float)
+    sampler = qmc.Sobol(len(times) - 1, scramble=True, seed=seed)
+    if skip:
+        sampler.fast_forward(skip)
+    with warnings.catch_warnings():
+        # Sobol warns when num_paths is not a power of two
+        warnings.simplefilter("ignore", UserWarning)
+        uniforms = sampler.random(num_paths)
+    return brownian_bridge(norm.ppf(uniforms), times)
+
+
+def brownian_bridge(normals, times):
+    """
+    Standardised Brownian increments built from ``normals`` by bridging.
+
+    Column 0 of ``normals`` sets W(t_n), and every next column sets the
+    midpoint (in index) of an interval whose ends are already known, in
+    breadth-first order.
+    """
+    times = np.asarray(times, dtype=float)
+    steps = len(times) - 1
+    w = np.zeros((len(normals), steps + 1))
+    w[:, steps] = np.sqrt(times[steps] - times[0]) * normals[:, 0]
+    column = 1
+    intervals = deque([(0, steps)])
+    while intervals:
+        left, right = intervals.popleft()
+        if right - left < 2:
+            continue
+        middle = (left + right) // 2
+        t_left, t_middle, t_right = times[[left, middle, right]]
+        weight = (t_middle - t_left) / (t_right - t_left)
+        std = np.sqrt(
+            (t_middle - t_left) * (t_right - t_middle) / (t_right - t_left)
+        )
+        w[:, middle] = (
+            w[:, left]
+            + weight * (w[:, right] - w[:, left])
+            + std * normals[:, column]
+        )
+        column += 1
+        intervals.append((left, middle))
+        intervals.append((middle, right))
+    return np.diff(w, axis=1) / np.sqrt(np.diff(times))
+
+
+def ou_paths(a, sigma, times, normals):
+    """
+    Exact paths of dx = -a x dt + sigma dW, x(0) = 0, driven by ``normals``.
+
+    Returns:
+    np.ndarray: Paths of shape (len(normals), len(times)).
+    """
+    dt = np.diff(times)
+    std = hw_std(a, sigma, dt)
+    x = np.empty((len(normals), len(times)))
+    x[:, 0] = 0.0
+    if a * times[-1] < _MAX_DECAY_EXPONENT:
+        # x[i] = exp(-a t[i]) * sum_{j<i} exp(a t[j+1]) std[j] Z[j]
+        np.multiply(normals, np.exp(a * times[1:]) * std, out=x[:, 1:])
+        np.cumsum(x[:, 1:], axis=1, out=x[:, 1:])
+        x[:, 1:] *= np.exp(-a * times[1:])
+    else:
+        decay = np.exp(-a * dt)
+        for i in range(len(dt)):
+            x[:, i + 1] = decay[i] * x[:, i] + std[i] * normals[:, i]
+    return x
@@ -0,0 +1,221 @@
+import threading
+
+import QuantLib as ql
+
+from finance import executor
+
+# Live curves of worker processes, by deposit tenor
+_worker_curves = {}
+# Calendar days of fixings sent along to worker processes, enough to reach
+# the latest fixing over long holidays
+RECENT_FIXING_DAYS = 10
+
+
+class LiveCurve:
+    """
+    Long-lived Euribor discount curve whose market quotes are updated in place.
+
+    The rate helpers, calendar and day counters are created once. New market
+    data is pushed into the existing ``ql.SimpleQuote`` objects with
+    ``setValue``, so QuantLib only marks the curve as dirty and re-bootstraps
+    lazily on the next query. The helper set is rebuilt only when the set of
+    quoted swap tenors changes. The live curve itself is never handed out:
+    its nodes are copied into a curve of their own, see ``node_curve``.
+
+    Parameters:
+    deposit_rate (QuantLib.IborIndex): Euribor index the swaps float against.
+    deposit_period (QuantLib.Period): Tenor of the deposit helper.
+    """
+
+    def __init__(self, deposit_rate, deposit_period):
+        self.calendar = ql.TARGET()
+        self.deposit_rate = deposit_rate
+        self.deposit_period = deposit_period
+        self.deposit_day_counter = ql.Actual360()
+        self.swap_day_counter = ql.Thirty360(ql.Thirty360.BondBasis)
+        self.curve_day_counter = ql.Actual365Fixed()
+        self.deposit_quote = ql.SimpleQuote(0.0)
+        self.swap_quotes = {}
+        self.curve = None
+        # Bootstraps run on executor threads: one at a time per live curve
+        self._lock = threading.Lock()
+
+    def update(self, swaps, deposit_rate):
+        """
+        Push the latest quotes into the curve.
+
+        Parameters:
+        swaps (dict): Real-time swap rates with 'tenor' and 'rate'
+            columns, rates in percent.
+        deposit_rate (float): Latest deposit fixing in percent.
+
+        Returns:
+        QuantLib.PiecewiseLogCubicDiscount: The (same) live curve object.
+        """
+        rates = {
+            tenor: float(rate) / 100
+            for tenor, rate in zip(swaps["tenor"], swaps["rate"])
+        }
+        self.deposit_quote.setValue(deposit_rate / 100)
+        if self.curve is None or rates.keys() != self.swap_quotes.keys():
+            self._build(rates)
+        else:
+            for tenor, quote in self.swap_quotes.items():
+                quote.setValue(rates[tenor])
+        return self.curve
+
+    def nodes(self, swaps, deposit_rate):
+        """
+        Push the latest quotes, bootstrap the curve and return its nodes.
+        Safe to call from several threads; the quotes are only moved under
+        a lock held until the nodes are read.
+
+        Returns:
+        tuple: (date serial numbers, discount factors) of the curve nodes.
+        """
+        with self._lock:
+            nodes = self.update(swaps, deposit_rate).nodes()
+        return [d.serialNumber() for d, _ in nodes], [v for _, v in nodes]
+
+    def node_curve(self, dates, discounts):
+        """
+        A curve of its own on bootstrapped nodes, with the conventions of
+        the live curve.
+
+        Parameters:
+        dates (list): Date serial numbers of the nodes.
+        discounts (list): Discount factors of the nodes.
+
+        Returns:
+        QuantLib.LogCubicDiscountCurve: The curve, extrapolated.
+        """
+        curve = ql.LogCubicDiscountCurve(
+            [ql.Date(serial) for serial in dates],
+            discounts,
+            self.curve_day_counter,
+            self.calendar,
+        )
+        curve.enableExtrapolation()
+        return curve
+
+    def _build(self, rates):
+        self.swap_quotes = {
+            tenor: ql.SimpleQuote(rate) for tenor, rate in rates.items()
+        }
+        helpers = [
+            ql.DepositRateHelper(
+                ql.QuoteHandle(self.deposit_quote),
+                self.deposit_period,
+                2,
+                self.calendar,
+                ql.Following,
+                False,
+                self.deposit_day_counter,
+            )
+        ]
+        # Create helpers for each tenor
+        for tenor, quote in self.swap_quotes.items():
+            helpers.append(
+                ql.SwapRateHelper(
+                    ql.QuoteHandle(quote),
+                    ql.Period(tenor),
+                    self.calendar,
+                    ql.Annual,
+                    ql.Unadjusted,
+                    self.swap_day_counter,
+                    self.deposit_rate,
+                    ql.QuoteHandle(),
+                    ql.Period(0, ql.Days),
+                )
+            )
+        self.curve = ql.PiecewiseLogCubicDiscount(
+            0, self.calendar, helpers, self.curve_day_counter
+        )
+        self.curve.enableExtrapolation()
+
+
+async def bootstrap(live_curve, swaps, deposit_rate):
+    """
+    Push quotes into ``live_curve``, bootstrap it in the configured executor
+    and return a ``LogCubicDiscountCurve`` on the resulting nodes.
+
+    The returned curve reproduces the live one but is a separate object
+    that later updates never touch, so a curve handed out to callers keeps
+    the data it was built from while the next version is bootstrapped.
+    With a process executor the bootstrap runs on a live curve of the worker
+    process instead.
+
+    Parameters:
+    live_curve (LiveCurve): Curve of the index.
+    swaps (dict): Real-time swap rates with 'tenor' and 'rate'
+        columns, rates in percent.
+    deposit_rate (float): Latest deposit fixing in percent.
+
+    Returns:
+    QuantLib.LogCubicDiscountCurve: The bootstrapped curve.
+    """
+    if executor.EXECUTOR == "process":
+        evaluation_date = ql.Settings.instance().evaluationDate
+        dates, discounts = await executor.run_cpu(
+            bootstrap_nodes,
+            str(live_curve.deposit_period),
+            evaluation_date.serialNumber(),
+            swaps,
+            deposit_rate,
+            recent_fixings(live_curve.deposit_rate, evaluation_date),
+        )
+    else:
+        dates, discounts = await executor.run_cpu(
+            live_curve.nodes, swaps, deposit_rate
+        )
+    return live_curve.node_curve(dates, discounts)
+
+
+def recent_fixings(index, evaluation_date, days=RECENT_FIXING_DAYS):
+    """
+    Fixings of ``index`` over the last ``days`` up to the evaluation date.
+
+    Returns:
+    tuple: (date serial numbers, rates) of the fixings found.
+    """
+    serials = []
+    rates = []
+    for offset in range(days, -1, -1):
+        day = evaluation_date - offset
+        if index.hasHistoricalFixing(day):
+            serials.append(day.serialNumber())
+            rates.append(index.pastFixing(day))
+    return serials, rates
+
+
+def bootstrap_nodes(tenor, evaluation_date, swaps, deposit_rate, fixings=None):
+    """
+    Bootstrap a Euribor curve and return its nodes as plain lists, for use
+    in a worker process.
+
+    The worker's index only has the fixings passed in ``fixings``, which
+    the swap helpers need when their first coupon has already fixed.
+
+    Parameters:
+    tenor (str): Euribor tenor, e.g. "6M".
+    evaluation_date (int): Serial number of the evaluation date.
+    swaps (dict): Real-time swap rates in percent.
+    deposit_rate (float): Latest deposit fixing in percent.
+    fixings (tuple): (date serial numbers, rates) of recent fixings, as
+        returned by ``recent_fixings``.
+
+    Returns:
+    tuple: (date serial numbers, discount factors) of the curve nodes.
+    """
+    ql.Settings.instance().evaluationDate = ql.Date(evaluation_date)
+    live_curve = _worker_curves.get(tenor)
+    if live_curve is None:
+        period = ql.Period(tenor)
+        live_curve = LiveCurve(ql.Euribor(period), period)
+        _worker_curves[tenor] = live_curve
+    if fixings and fixings[0]:
+        serials, rates = fixings
+        live_curve.deposit_rate.addFixings(
+            [ql.Date(serial) for serial in serials], rates, True
+        )
+    return live_curve.nodes(swaps, deposit_rate)
@@ -0,0 +1,140 @@
+"""Batch pricing of a loan book under one shared set of rate scenarios."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from finance.mortgage import MONTHS_PER_YEAR, annuity_schedule, monthly_rates
+
+# Columns a loan book must have; 'spread' (decimal) defaults to 0
+LOAN_COLUMNS = ["loan_id", "principal", "years", "start_date"]
+# Upper bound, in bytes, of the arrays of one chunk of loans
+CHUNK_BYTES = int(os.environ.get("LOAN_BOOK_CHUNK_BYTES", 64 * 2**20))
+# Percentiles reported for every loan
+PERCENTILES = (5, 50, 95)
+
+
+def load_loan_book(path):
+    """
+    Read a loan book from a CSV or Parquet file.
+
+    Parameters:
+    path (str): File with 'loan_id', 'principal', 'years', 'start_date' and
+        optionally 'spread' columns; '.parquet' files are read as Parquet.
+
+    Returns:
+    pd.DataFrame: The loans, with parsed start dates.
+    """
+    if str(path).endswith(".parquet"):
+        book = pd.read_parquet(path)
+    else:
+        book = pd.read_csv(path)
+    missing = [column for column in LOAN_COLUMNS if column not in book]
+    if missing:
+        raise ValueError(f"Loan book {path} is missing columns: {missing}")
+    if "spread" not in book:
+        book["spread"] = 0.0
+    book["start_date"] = pd.to_datetime(book["start_date"])
+    return book
+
+
+def start_months(start_dates, reference_date):
+    """Whole months from ``reference_date`` to every loan start."""
+    starts = pd.DatetimeIndex(pd.to_datetime(start_dates))
+    reference = pd.Timestamp(reference_date)
+    return np.asarray(
+        (starts.year - reference.year) * MONTHS_PER_YEAR
+        + (starts.month - reference.month)
+    )
+
+
+def book_horizon(book, reference_date):
+    """
+    Years from ``reference_date`` to the end of the last loan of ``book``:
+    how far the paths given to ``price_loan_book`` must reach.
+    """
+    starts = start_months(book["start_date"], reference_date)
+    return float((starts + _term_months(book)).max()) / MONTHS_PER_YEAR
+
+
+def _term_months(book):
+    return np.rint(book["years"].to_numpy() * MONTHS_PER_YEAR).astype(int)
+
+
+def price_loan_book(
+    book,
+    rates,
+    times,
+    reference_date,
+    percentiles=PERCENTILES,
+    chunk_bytes=CHUNK_BYTES,
+):
+    """
+    Payment distributions of every loan of a book under the same paths.
+
+    Monthly average rates are computed once for the whole path set. Loans
+    are then grouped by term and amortized in chunks of at most
+    ``chunk_bytes``, so memory stays bounded whatever the size of the book.
+    Loans start on the month of their start date.
+
+    Parameters:
+    book (pd.DataFrame): Loans, as returned by ``load_loan_book``.
+    rates (np.ndarray): Short-rate paths of shape (paths, len(times)).
+    times (np.ndarray): Time grid of the paths, in years from
+        ``reference_date``, up to at least ``book_horizon``.
+    reference_date (date-like): Date of time 0 of the paths.
+    percentiles (tuple): Percentiles of the distributions to report.
+    chunk_bytes (int): Memory budget of one chunk of loans.
+
+    Returns:
+    pd.DataFrame: Per loan (indexed by 'loan_id'), the mean, standard
+        deviation and percentiles of the total paid, the mean first payment
+        and the percentiles of the largest monthly payment.
+    """
+    rates = np.atleast_2d(rates)
+    num_paths = len(rates)
+    starts = start_months(book["start_date"], reference_date)
+    if (starts < 0).any():
+        early = list(book["loan_id"][starts < 0])
+        raise ValueError(f"Loans start before the scenarios: {early}")
+    terms = _term_months(book)
+    principals = book["principal"].to_numpy(dtype=float)
+    spreads = book.get("spread", pd.Series(0.0, index=book.index))
+    spreads = spreads.to_numpy(dtype=float)
+
+    monthly = monthly_rates(rates, times, int((starts + terms).max()))
+
+    columns = ["total_paid_mean", "total_paid_std", "first_payment_mean"]
+    columns += [f"total_paid_p{q}" for q in percentiles]
+    columns += [f"max_payment_p{q}" for q in percentiles]
+    results = {column: np.empty(len(book)) for column in columns}
+    for term in np.unique(terms):
+        (loans,) = np.nonzero(terms == term)
+        # annual rates, payments, balances and temporaries of one loan
+        size = max(1, chunk_bytes // (4 * 8 * num_paths * term))
+        for first in range(0, len(loans), size):
+            last = first + size
+            chunk = loans[first:last]
+            months = starts[chunk, None] + np.arange(term)
+            annual = monthly[:, months].transpose(1, 0, 2)
+            annual += spreads[chunk, None, None]
+            payments, _ = annuity_schedule(annual, principals[chunk, None])
+
+            totals = payments.sum(axis=2)
+            results["total_paid_mean"][chunk] = totals.mean(axis=1)
+            results["total_paid_std"][chunk] = totals.std(axis=1, ddof=1)
+            results["first_payment_mean"][chunk] = payments[:, :, 0].mean(
+                axis=1
+            )
+            total_percentiles = np.percentile(totals, percentiles, axis=1)
+            max_percentiles = np.percentile(
+                payments.max(axis=2), percentiles, axis=1
+            )
+            for i, q in enumerate(percentiles):
+                results[f"total_paid_p{q}"][chunk] = total_percentiles[i]
+                results[f"max_payment_p{q}"][chunk] = max_percentiles[i]
+
+    return pd.DataFrame(
+        results, index=pd.Index(book["loan_id"], name="loan_id")
+    )
@@ -0,0 +1,202 @@
+"""On-disk columnar cache of market data, for cold starts and offline runs."""
+
+import contextlib
+import importlib.util
+import os
+import tempfile
+
+import numpy as np
+
+
+def default_cache_dir():
+    """
+    ~/.cache/finance, or a directory under the temporary directory on AWS
+    Lambda, whose file system is read-only but for /tmp, and wherever the
+    home directory is not writable.
+    """
+    home = os.path.expanduser("~")
+    if "AWS_LAMBDA_FUNCTION_NAME" in os.environ or not os.access(
+        home, os.W_OK
+    ):
+        return os.path.join(tempfile.gettempdir(), "finance")
+    return os.path.join(home, ".cache", "finance")
+
+
+# Directory of the market data files
+MARKET_CACHE_DIR = os.path.join(
+    os.environ.get("FINANCE_CACHE_DIR") or default_cache_dir(), "market"
+)
+# With FINANCE_OFFLINE=1 market data is read from the cache only, never
+# from the database, e.g. for batch and calibration jobs
+OFFLINE = os.environ.get("FINANCE_OFFLINE", "0") == "1"
+
+# Parquet needs the optional pyarrow, imported on first use only; without
+# it the cache uses NumPy .npz files
+PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+# Swap quotes last written, by file name, to skip unchanged rewrites
+_written_swaps = {}
+
+
+def cache_path(name, directory=None):
+    """File of the cached ``name``: Parquet, or .npz without pyarrow."""
+    extension = ".parquet" if PARQUET else ".npz"
+    return os.path.join(directory or MARKET_CACHE_DIR, name + extension)
+
+
+def read_columns(name, directory=None):
+    """
+    Columns cached under ``name``.
+
+    Returns:
+    dict: Column name -> np.ndarray, or None when nothing is cached.
+    """
+    path = cache_path(name, directory)
+    if not os.path.exists(path):
+        return None
+    if not PARQUET:
+        with np.load(path, allow_pickle=False) as data:
+            return {column: data[column] for column in data.files}
+    pa, pq = _pyarrow()
+    table = pq.read_table(path, memory_map=True)
+    columns = {}
+    for column in table.column_names:
+        values = table.column(column).to_numpy()
+        if pa.types.is_string(table.schema.field(column).type):
+            values = values.astype(str)
+        columns[column] = values
+    return columns
+
+
+def write_columns(name, columns, directory=None):
+    """
+    Cache ``columns`` under ``name``, replacing the file atomically.
+
+    The cache is best-effort: when the file cannot be written the error is
+    reported and callers carry on with the data they have.
+
+    Returns:
+    bool: Whether the file was written.
+    """
+    path = cache_path(name, directory)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if PARQUET:
+            pa, pq = _pyarrow()
+            pq.write_table(pa.table(columns), temporary)
+        else:
+            with open(temporary, "wb") as file:
+                np.savez(file, **columns)
+        os.replace(temporary, path)
+    except OSError as e:
+        print(f"Error writing market cache {path}: {str(e)}")
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+        return False
+    return True
+
+
+def _pyarrow():
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    return pa, pq
+
+
+def read_fixings(index_name, index, directory=None):
+    """Cached 'date' and 'rate' fixings of an index, or None."""
+    return read_columns(f"fixings_{index_name}_{index}", directory)
+
+
+def fixings_since(cached, starting_at=None):
+    """
+    Date after which fixings still have to be fetched from the database,
+    given the cached ones; None to fetch them all.
+    """
+    if cached is None or len(cached["date"]) == 0:
+        return starting_at
+    last = cached["date"][-1].item()
+    if starting_at is None or starting_at < last:
+        return last
+    return starting_at
+
+
+def update_fixings(
+    index_name, index, cached, fetched, starting_at=None, directory=None
+):
+    """
+    Merge the cached fixings of an index with the ones just fetched, after
+    ``fixings_since``, and extend the cache with the fetched rows.
+
+    The cache is only extended when the fetched rows continue it, so that
+    it never has gaps.
+
+    Parameters:
+    index_name (str): Index family, e.g. "EURIBOR".
+    index (str): Tenor, e.g. "6M".
+    cached (dict): Cached fixings, or None when not read; they are then
+        only read if there is something to append.
+    fetched (dict): 'date' (datetime64[D]) and 'rate' arrays fetched from
+        the database.
+    starting_at (date): Only fixings after this date are returned.
+
+    Returns:
+    dict: 'date' and 'rate' arrays of the fixings after ``starting_at``.
+    """
+    if len(fetched["date"]):
+        if cached is None:
+            cached = read_fixings(index_name, index, directory)
+        if cached is None:
+            contiguous = starting_at is None
+            stored = fetched
+        else:
+            last = cached["date"][-1].item() if len(cached["date"]) else None
+            contiguous = (
+                last is None or starting_at is None or (starting_at <= last)
+            )
+            stored = {
+                column: np.concatenate([cached[column], fetched[column]])
+                for column in ("date", "rate")
+            }
+        if contiguous:
+            write_columns(f"fixings_{index_name}_{index}", stored, directory)
+            cached = stored
+        else:
+            cached = fetched
+    if cached is None:
+        return fetched
+    if starting_at is None:
+        return cached
+    after = cached["date"] > np.datetime64(starting_at, "D")
+    return {column: cached[column][after] for column in ("date", "rate")}
+
+
+def read_swaps(index_name, index, directory=None):
+    """
+    Cached 'tenor' and 'rate' swap quotes of an index.
+
+    Raises:
+    ValueError: When nothing is cached for the index.
+    """
+    swaps = read_columns(f"swaps_{index_name}_{index}", directory)
+    if swaps is None:
+        raise ValueError(f"No cached swap rates for {index_name} {index}")
+    return swaps
+
+
+def write_swaps(index_name, index, swaps, directory=None):
+    """Cache the 'tenor' and 'rate' swap quotes of an index if they moved."""
+    name = f"swaps_{index_name}_{index}"
+    quotes = {
+        "tenor": np.asarray(swaps["tenor"], dtype=str),
+        "rate": np.asarray(swaps["rate"], dtype=float),
+    }
+    key = (directory or MARKET_CACHE_DIR, name)
+    previous = _written_swaps.get(key)
+    if previous is not None and all(
+        np.array_equal(previous[column], quotes[column]) for column in quotes
+    ):
+        return
+    if write_columns(name, quotes, directory):
+        _written_swaps[key] = quotes
@@ -0,0 +1,184 @@
+"""Market data of several indices read in one query, at one point in time."""
+
+import numpy as np
+from pypika import Order, Query, Table, functions as fn
+from pypika.terms import NullValue, Parameter, ValueWrapper
+
+from finance import market_cache
+from finance.db import fetch_columns
+from finance.fixings import FIXING_DTYPES, fixings_store
+
+# Types of the columns of the snapshot query
+SNAPSHOT_DTYPES = {
+    "kind": object,
+    "index": object,
+    "tenor": object,
+    **FIXING_DTYPES,
+}
+
+
+class MarketSnapshot:
+    """
+    Swap quotes and new fixings of several indices, as of one query.
+
+    Parameters:
+    swaps (dict): Index -> {'tenor', 'rate'} arrays of real-time swap
+        quotes, rates in percent.
+    fixings (dict): Index -> {'date', 'rate'} arrays of the fixings newer
+        than ``since``, in date order.
+    since (dict): Index -> date of the last fixing loaded before the
+        snapshot, or None when all fixings were read.
+    """
+
+    def __init__(self, swaps, fixings, since):
+        self.swaps = swaps
+        self.fixings = fixings
+        self.since = since
+
+    def last_fixing_date(self, index):
+        """Date of the latest fixing stored for ``index``, or None."""
+        dates = self.fixings[index]["date"]
+        if len(dates):
+            return dates[-1].item()
+        return self.since[index]
+
+    def version(self, index):
+        """
+        Identify the market data a curve for ``index`` is built from: the
+        swap quotes together with the date of the latest stored fixing.
+        """
+        swaps = self.swaps[index]
+        quotes = tuple(sorted(zip(swaps["tenor"], swaps["rate"].tolist())))
+        return quotes, str(self.last_fixing_date(index))
+
+
+def snapshot_query(index_name, since):
+    """
+    One UNION ALL query for the swap quotes of every index of ``since`` and
+    their fixings newer than the given dates.
+
+    The dates are left as ``%s`` parameters, so the query text only depends
+    on the indices and can be prepared; pass the dates that are not None,
+    in the order of ``since``.
+    """
+    indices = list(since)
+    real_time = Table("taxa_fixa_swap_rates_real_time")
+    historical = Table("taxa_fixa_fixings_historical")
+    swaps = (
+        Query.from_(real_time)
+        .select(
+            ValueWrapper("swap").as_("kind"),
+            real_time.index,
+            real_time.tenor,
+            fn.Cast(NullValue(), "DATE").as_("date"),
+            real_time.rate,
+        )
+        .where(real_time.index_name == index_name)
+        .where(real_time.index.isin(indices))
+    )
+    criteria = []
+    for index in indices:
+        criterion = historical.index == index
+        if since[index] is not None:
+            criterion &= historical.date > Parameter("%s")
+        criteria.append(criterion)
+    condition = criteria[0]
+    for criterion in criteria[1:]:
+        condition |= criterion
+    fixings = (
+        Query.from_(historical)
+        .select(
+            ValueWrapper("fixing"),
+            historical.index,
+            NullValue(),
+            historical.date,
+            historical.rate,
+        )
+        .where(historical.index_name == index_name)
+        .where(condition)
+    )
+    return (swaps * fixings).orderby("date", order=Order.asc)
+
+
+async def load_snapshot(index_name, indices):
+    """
+    Read the swap quotes and new fixings of several indices in a single
+    query, so one round trip serves every curve and all of them see the
+    database at the same point in time.
+
+    Only the fixings newer than those already loaded into each index's
+    ``FixingsStore`` are read; on a cold start, those newer than the
+    on-disk market cache. Fetched data is saved to that cache, and offline
+    the snapshot is read from it alone.
+
+    Parameters:
+    index_name (str): Index family, e.g. "EURIBOR".
+    indices (list): Tenors, e.g. ["1M", "3M", "6M"].
+
+    Returns:
+    MarketSnapshot: The snapshot.
+    """
+    since = {
+        index: fixings_store(index, index_name).last_date for index in indices
+    }
+    cached = {
+        index: (
+            market_cache.read_fixings(index_name, index)
+            if since[index] is None or market_cache.OFFLINE
+            else None
+        )
+        for index in indices
+    }
+    if market_cache.OFFLINE:
+        swaps, fetched = _read_cached(index_name, indices, cached)
+    else:
+        swaps, fetched = await _query(index_name, indices, since, cached)
+    fixings = {
+        index: market_cache.update_fixings(
+            index_name, index, cached[index], fetched[index], since[index]
+        )
+        for index in indices
+    }
+    return MarketSnapshot(swaps, fixings, since)
+
+
+async def _query(index_name, indices, since, cached):
+    query_since = {
+        index: market_cache.fixings_since(cached[index], since[index])
+        for index in indices
+    }
+    query = snapshot_query(index_name, query_since)
+    args = [day for day in query_since.values() if day is not None]
+    # Read on every revalidation: prepared once per connection
+    data = await fetch_columns(
+        str(query), args, dtypes=SNAPSHOT_DTYPES, prepared=True
+    )
+    swaps = {}
+    fetched = {}
+    for index in indices:
+        quotes = (data["kind"] == "swap") & (data["index"] == index)
+        swaps[index] = {
+            "tenor": data["tenor"][quotes].astype(str),
+            "rate": data["rate"][quotes],
+        }
+        market_cache.write_swaps(index_name, index, swaps[index])
+        fixed = (data["kind"] == "fixing") & (data["index"] == index)
+        fetched[index] = {
+            "date": data["date"][fixed],
+            "rate": data["rate"][fixed],
+        }
+    return swaps, fetched
+
+
+def _read_cached(index_name, indices, cached):
+    swaps = {}
+    fetched = {}
+    for index in indices:
+        if cached[index] is None:
+            raise ValueError(f"No cached fixings for {index_name} {index}")
+        swaps[index] = market_cache.read_swaps(index_name, index)
+        fetched[index] = {
+            "date": np.array([], dtype="datetime64[D]"),
+            "rate": np.array([], dtype=float),
+        }
+    return swaps, fetched
@@ -0,0 +1,134 @@
+"""Mortgage cashflows over simulated short-rate paths."""
+
+import numpy as np
+
+MONTHS_PER_YEAR = 12
+
+
+def monthly_rates(rates, times, months, start=0.0):
+    """
+    Average short rate over every month of a loan, for every path.
+
+    The short rate is integrated along each path with the trapezoidal rule
+    and the integral is read at the month boundaries, so every month gets
+    the mean of the path over that month whatever the simulation grid.
+
+    Parameters:
+    rates (np.ndarray): Short rates of shape (paths, len(times)).
+    times (np.ndarray): Increasing time grid of the paths, in years.
+    months (int): Number of months.
+    start (float): Time of the start of the first month, in years.
+
+    Returns:
+    np.ndarray: Monthly average rates of shape (paths, months).
+    """
+    rates = np.atleast_2d(rates)
+    times = np.asarray(times, dtype=float)
+    boundaries = start + np.arange(months + 1) / MONTHS_PER_YEAR
+    if boundaries[-1] > times[-1] + 1e-9:
+        raise ValueError(
+            f"Paths end at {times[-1]:.2f}Y, before the loan ends at "
+            f"{boundaries[-1]:.2f}Y"
+        )
+    integral = np.zeros(rates.shape)
+    np.cumsum(
+        0.5 * (rates[:, 1:] + rates[:, :-1]) * np.diff(times),
+        axis=1,
+        out=integral[:, 1:],
+    )
+    # Linear interpolation of the integral, shared positions for all paths
+    right = np.clip(np.searchsorted(times, boundaries), 1, len(times) - 1)
+    left = right - 1
+    weight = (boundaries - times[left]) / (times[right] - times[left])
+    values = integral[:, left] + weight * (
+        integral[:, right] - integral[:, left]
+    )
+    return np.diff(values, axis=1) * MONTHS_PER_YEAR
+
+
+def amortize(rates, times, principal, years, spread=0.0, start=0.0):
+    """
+    Floating-rate annuity cashflows for every path at once.
+
+    Every month the rate resets to the path's average short rate over the
+    month plus ``spread``, and the payment is the annuity that repays the
+    remaining principal over the remaining months at that rate.
+
+    Parameters:
+    rates (np.ndarray): Short rates of shape (paths, len(times)).
+    times (np.ndarray): Increasing time grid of the paths, in years.
+    principal (float): Amount borrowed.
+    years (int): Term of the loan.
+    spread (float): Margin added to the short rate, as a decimal.
+    start (float): Time of the start of the loan on the grid, in years.
+
+    Returns:
+    tuple: (monthly_rates, payments, balances) arrays of shape
+        (paths, years * 12): the annual rate applied in each month, the
+        payment of each month and the principal remaining after it.
+    """
+    months = int(round(years * MONTHS_PER_YEAR))
+    annual = monthly_rates(rates, times, months, start) + spread
+    payments, balances = annuity_schedule(annual, principal)
+    return annual, payments, balances
+
+
+def annuity_schedule(annual, principal):
+    """
+    Payments and balances of floating-rate annuities from their monthly
+    rates.
+
+    Parameters:
+    annual (np.ndarray): Annual rate applied in each month, months on the
+        last axis; any leading axes (loans, paths) are broadcast.
+    principal (float or np.ndarray): Amount borrowed, broadcastable against
+        ``annual`` without its last axis.
+
+    Returns:
+    tuple: (payments, balances) arrays shaped like ``annual``.
+    """
+    interest = annual / MONTHS_PER_YEAR
+    months = annual.shape[-1]
+    remaining = (months - np.arange(months)).astype(float)
+
+    # Share of the balance repaid each month, m / ((1 + m)^n - 1), -> 1 / n
+    # as m -> 0. Computed in place, these arrays can hold millions of values.
+    repaid = np.log1p(interest)
+    repaid *= remaining
+    np.expm1(repaid, out=repaid)
+    small = np.abs(interest) <= 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(interest, repaid, out=repaid)
+    if small.any():
+        repaid[small] = np.broadcast_to(1.0 / remaining, repaid.shape)[small]
+
+    principal = np.asarray(principal, dtype=float)[..., None]
+    balances = np.subtract(1.0, repaid)
+    np.cumprod(balances, axis=-1, out=balances)
+    balances *= principal
+    payments = interest
+    payments += repaid
+    payments[..., 0] *= principal[..., 0]
+    payments[..., 1:] *= balances[..., :-1]
+    return payments, balances
+
+
+def calculate_mortgage_payments(rates, rate_dates, principal, years):
+    """
+    Monthly payments of a mortgage along one short-rate path.
+
+    Parameters:
+    rates (array-like): Short rates of the path.
+    rate_dates (array-like): Times of the rates, in years.
+    principal (float): Amount borrowed.
+    years (int): Term of the loan.
+
+    Returns:
+    tuple: (payment_times, payments), the time in years of the start of
+        every month and its payment.
+    """
+    _, payments, _ = amortize(
+        np.asarray(rates, dtype=float)[None, :], rate_dates, principal, years
+    )
+    payment_times = np.arange(payments.shape[1]) / MONTHS_PER_YEAR
+    return payment_times, payments[0]
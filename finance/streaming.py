@@ -0,0 +1,119 @@
+"""Per-time-step statistics of paths streamed in chunks."""
+
+import os
+
+import numpy as np
+
+# Up to this many buffered values (paths x steps) quantiles are exact; above
+# it the buffer is dropped and quantiles come from the histogram sketch
+EXACT_VALUES = int(os.environ.get("FINANCE_EXACT_VALUES", 2**22))
+# Histogram bins per time step of the sketch
+SKETCH_BINS = 256
+
+
+def combine_moments(first, second):
+    """Chan et al. parallel combination of (count, mean, M2) moments."""
+    count_a, mean_a, m2_a = first
+    count_b, mean_b, m2_b = second
+    count = count_a + count_b
+    if count_a == 0:
+        return second
+    if count_b == 0:
+        return first
+    delta = mean_b - mean_a
+    mean = mean_a + delta * count_b / count
+    m2 = m2_a + m2_b + delta**2 * count_a * count_b / count
+    return count, mean, m2
+
+
+class StreamingStats:
+    """
+    Mergeable per-step means, variances and quantiles of streamed paths.
+
+    Means and variances are running (Chan) moments. Quantiles are exact
+    while the paths seen so far fit in ``exact_values`` numbers, which are
+    buffered; past that the buffer is dropped and quantiles are read from a
+    per-step histogram on fixed edges, kept from the start. Memory is then
+    constant in the number of paths, and quantiles are accurate to a
+    fraction of a bin.
+
+    Parameters:
+    lower (np.ndarray): Lower edge of the histogram at every time step.
+    upper (np.ndarray): Upper edge of the histogram at every time step.
+    bins (int): Number of histogram bins per step.
+    exact_values (int): Largest number of buffered values.
+    """
+
+    def __init__(
+        self, lower, upper, bins=SKETCH_BINS, exact_values=EXACT_VALUES
+    ):
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.exact_values = exact_values
+        self.count = 0
+        self.mean = np.zeros(len(self.lower))
+        self.m2 = np.zeros(len(self.lower))
+        self.histogram = np.zeros((len(self.lower), bins), dtype=np.int64)
+        self._buffer = []
+
+    @property
+    def exact(self):
+        """Whether quantiles are still computed from every value."""
+        return self._buffer is not None
+
+    @property
+    def variance(self):
+        return self.m2 / max(self.count - 1, 1)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def add(self, values):
+        """Add a (paths x steps) chunk of values."""
+        values = np.asarray(values, dtype=float)
+        steps, bins = self.histogram.shape
+        width = (self.upper - self.lower) / bins
+        index = np.floor((values - self.lower) / width).astype(np.int64)
+        np.clip(index, 0, bins - 1, out=index)
+        index += np.arange(steps) * bins
+        histogram = np.bincount(index.ravel(), minlength=steps * bins)
+        self.histogram += histogram.reshape(steps, bins)
+
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        self.count, self.mean, self.m2 = combine_moments(
+            (self.count, self.mean, self.m2), (len(values), mean, m2)
+        )
+        self._keep([values])
+
+    def merge(self, other):
+        """Fold the statistics of another, disjoint, stream into this one."""
+        self.histogram += other.histogram
+        self.count, self.mean, self.m2 = combine_moments(
+            (self.count, self.mean, self.m2),
+            (other.count, other.mean, other.m2),
+        )
+        self._keep(other._buffer)
+        return self
+
+    def percentile(self, q):
+        """Per-step percentile ``q`` (0-100)."""
+        if self.exact:
+            return np.percentile(np.concatenate(self._buffer), q, axis=0)
+        steps, bins = self.histogram.shape
+        cumulative = np.cumsum(self.histogram, axis=1)
+        target = q / 100 * self.count
+        index = np.minimum((cumulative < target).sum(axis=1), bins - 1)
+        rows = np.arange(steps)
+        below = np.where(index > 0, cumulative[rows, index - 1], 0)
+        in_bin = np.maximum(self.histogram[rows, index], 1)
+        fraction = np.clip((target - below) / in_bin, 0.0, 1.0)
+        width = (self.upper - self.lower) / bins
+        return self.lower + (index + fraction) * width
+
+    def _keep(self, chunks):
+        if chunks is None or self.count * len(self.lower) > self.exact_values:
+            self._buffer = None
+        elif self._buffer is not None:
+            self._buffer.extend(chunks)
@@ -1,14 +1,51 @@
-from datetime import datetime
-
+import numpy as np
 import QuantLib as ql
-from matplotlib import pyplot as plt
 from pypika import Query, Table
 
-from finance.db import query_db
+from finance import market_cache
+from finance.dates import (
+    add_period,
+    advance,
+    ql_epoch_days,
+    schedule,
+    year_fractions,
+)
+from finance.db import fetch_columns
+from finance.snapshot import CurveSnapshot
+
+ACTUAL_360 = ql.Actual360()
+TARGET = ql.TARGET()
+SECONDS_PER_DAY = 86400
+
+DAY_COUNTERS = {
+    "Actual360": ACTUAL_360,
+    "Actual365Fixed": ql.Actual365Fixed(),
+    "Thirty360": ql.Thirty360(ql.Thirty360.BondBasis),
+    "ActualActual": ql.ActualActual(ql.ActualActual.ISDA),
+}
+COMPOUNDINGS = {
+    "Simple": ql.Simple,
+    "Continuous": ql.Continuous,
+    "Compounded": ql.Compounded,
+}
+FREQUENCIES = {
+    "Annual": ql.Annual,
+    "Semiannual": ql.Semiannual,
+    "Quarterly": ql.Quarterly,
+    "Monthly": ql.Monthly,
+}
 
 
 async def get_swap_rate(index_name, index):
-
+    """
+    Real-time swap quotes of an index. Their 'tenor' and 'rate' are saved
+    to the on-disk market cache, which is all that is read offline.
+
+    Returns:
+    dict: Column name -> np.ndarray, including 'tenor' and 'rate' (percent).
+    """
+    if market_cache.OFFLINE:
+        return market_cache.read_swaps(index_name, index)
     real_time = Table("taxa_fixa_swap_rates_real_time")
 
     query = (
@@ -18,36 +55,92 @@ async def get_swap_rate(index_name, index):
     )
     if index is not None:
         query = query.where(real_time.index == index)
-    swaps = await query_db(str(query))
+    swaps = await fetch_columns(str(query))
+    market_cache.write_swaps(index_name, index, swaps)
     return swaps
 
-def curve_values(curve,index):
-    ##create a max date that is 5 years from now
-    max_date = curve.referenceDate() + ql.Period("5Y")
-    schedule = ql.MakeSchedule(
-        curve.referenceDate(), max_date, ql.Period("1M")
-    )
 
-    # Extract discount factors at each date in the schedule
-    times = []
-    rates = []
+def curve_values(curve, index, horizon="5Y", step="1M"):
+    """
+    Forward rates of tenor ``index`` on a regular schedule from the curve's
+    reference date up to ``horizon``, every ``step``.
+
+    Returns:
+    (list, list): POSIX timestamps of the start dates and forward rates.
+    """
+    reference = curve.referenceDate()
+    days = schedule(reference, reference + ql.Period(horizon), ql.Period(step))
+    _, rates = forward_rates(curve, days, index)
+    return (days * SECONDS_PER_DAY).tolist(), rates.tolist()
+
+
+def forward_rates(
+    curve,
+    start_days,
+    tenor,
+    day_counter=ACTUAL_360,
+    compounding=ql.Simple,
+    frequency=ql.Annual,
+    calendar=TARGET,
+):
+    """
+    Batch version of ``curve.forwardRate`` over many start dates.
+
+    End dates are the start dates advanced by ``tenor`` on ``calendar`` (or
+    left unadjusted when ``calendar`` is None). Discount factors are read
+    once per distinct date and the rates are implied on whole arrays.
+
+    Parameters:
+    curve (QuantLib.YieldTermStructure or CurveSnapshot): Curve to evaluate.
+    start_days (np.ndarray): Start dates as int64 days since 1970-01-01.
+    tenor (str or QuantLib.Period): Length of each forward period.
+    day_counter (QuantLib.DayCounter): Day count of the forward rates.
+    compounding (int): QuantLib compounding convention.
+    frequency (int): Compounding frequency for compounded rates.
+    calendar (QuantLib.Calendar): Calendar used to advance the start dates.
+
+    Returns:
+    (np.ndarray, np.ndarray): Times of the start dates from the curve's
+        reference date (in the curve's day count) and forward rates.
+    """
+    start_days = np.asarray(start_days, dtype=np.int64)
+    period = ql.Period(tenor) if isinstance(tenor, str) else tenor
+    if calendar is None:
+        end_days = add_period(start_days, period)
+    else:
+        end_days = advance(calendar, start_days, period)
+
+    curve_day_counter = curve.dayCounter()
+    reference = ql_epoch_days([curve.referenceDate()])[0]
+    days, positions = np.unique(
+        np.concatenate([start_days, end_days]), return_inverse=True
+    )
+    times = year_fractions(
+        curve_day_counter, np.full(len(days), reference), days
+    )
+    if isinstance(curve, CurveSnapshot):
+        discounts = curve.discount(times)
+    else:
+        discounts = np.array([curve.discount(t) for t in times])
+    start, end = np.split(positions, 2)
+
+    tau = year_fractions(day_counter, start_days, end_days)
+    growth = discounts[start] / discounts[end]
+    if compounding == ql.Simple:
+        rates = (growth - 1) / tau
+    elif compounding == ql.Continuous:
+        rates = np.log(growth) / tau
+    elif compounding == ql.Compounded:
+        rates = (growth ** (1 / (frequency * tau)) - 1) * frequency
+    else:
+        raise ValueError(f"Unsupported compounding: {compounding}")
+    return times[start], rates
 
-    for date in schedule:
-        #iso string datetime
-        py_datetime = datetime(date.year(), date.month(), date.dayOfMonth())
-        times.append(py_datetime.timestamp())
-        rates.append(
-            curve.forwardRate(
-                date,
-                ql.TARGET().advance(date, ql.Period(index)),
-                ql.Actual360(),
-                ql.Simple,
-            ).rate()
-        )
-    return times, rates
 
 def plot_curve(curve):
     """Function to plot the discount factors using a schedule."""
+    # Imported here: matplotlib is slow to import and the API never plots
+    from matplotlib import pyplot as plt
 
     # Create a schedule based on the curve's reference and max date, with 3M intervals
     schedule = ql.MakeSchedule(
@@ -85,16 +178,3 @@ def plot_curve(curve):
     plt.grid(True)
     plt.legend()
     plt.show()
-
-
-def get_ql_quotes_periods(data):
-    entries = data.to_dict(orient="records")
-    res = []
-    for entry in entries:
-        tenor = entry["tenor"]
-        ql_quote_handle = ql.QuoteHandle(
-            ql.SimpleQuote(float(entry["rate"]) / 100)
-        )
-        ql_period = ql.Period(tenor)
-        res.append((ql_quote_handle, ql_period))
-    return res
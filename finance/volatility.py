@@ -0,0 +1,128 @@
+"""Rolling historical volatility surface of Euribor fixings."""
+
+import numpy as np
+import pandas as pd
+
+# Rolling windows of the surface, in rows of the daily forward-filled series
+VOLATILITY_WINDOWS = {
+    "1Y": 252,
+    "2Y": 504,
+    "5Y": 1260,
+    "10Y": 2520,
+    "15Y": 3780,
+    "20Y": 5040,
+}
+# Annualisation factor of the daily standard deviations
+TRADING_DAYS = 252
+
+
+class VolatilitySurface:
+    """
+    Multi-window rolling volatility of log returns, updated incrementally.
+
+    Keeps prefix sums of the (shifted) log returns and of their squares, so
+    the standard deviation over any window is a difference of two entries
+    and all windows come out of one pass. Appending fixings extends the
+    prefix sums and computes only the new rows of the surface.
+
+    Rows follow ``calibrate.calculate_volatility``: fixings are forward
+    filled to every calendar day, returns that are not finite (a change of
+    sign, or a move from or to a zero fixing) are skipped, and a row is
+    emitted once every window is full.
+
+    Parameters:
+    windows (dict): Window lengths in rows, keyed by the column label.
+    """
+
+    def __init__(self, windows=VOLATILITY_WINDOWS):
+        self.windows = dict(windows)
+        self.first_date = None
+        self.last_date = None
+        self.last_rate = None
+        self._shift = 0.0
+        self._sums = np.zeros(1)
+        self._squares = np.zeros(1)
+        self._rows = []
+
+    def update(self, df):
+        """
+        Append fixings and return the new rows of the surface.
+
+        Parameters:
+        df (pd.DataFrame): Fixings with 'date' and 'rate' columns; dates up
+            to the last one already added are ignored. Log returns that are
+            not finite, e.g. from a zero fixing, are skipped.
+
+        Returns:
+        pd.DataFrame: 'Date' and one '<label> Volatility' column per window,
+            indexed by the position of the day in the forward-filled series.
+        """
+        input_dates = pd.to_datetime(df["date"])
+        rates = pd.Series(
+            df["rate"].to_numpy(dtype=float),
+            index=input_dates.to_numpy(dtype="datetime64[D]"),
+        ).sort_index()
+        rates = rates[~rates.index.duplicated(keep="last")]
+        if self.last_date is not None:
+            rates = rates[rates.index > self.last_date]
+        if rates.empty:
+            return self._frame([])
+
+        # Forward fill to every calendar day, continuing the stored series
+        dates = rates.index.to_numpy(dtype="datetime64[D]")
+        values = rates.to_numpy()
+        if self.first_date is None:
+            self.first_date = dates[0]
+        else:
+            dates = np.concatenate([[self.last_date], dates])
+            values = np.concatenate([[self.last_rate], values])
+        days = np.arange(dates[0], dates[-1] + 1)
+        filled = np.full(len(days), np.nan)
+        filled[(dates - days[0]).astype(np.int64)] = values
+        filled = pd.Series(filled).ffill().to_numpy()
+        self.last_date, self.last_rate = days[-1], filled[-1]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.log(filled[1:] / filled[:-1])
+        valid = np.isfinite(returns)
+        returns = returns[valid]
+        positions = (days[1:][valid] - self.first_date).astype(np.int64)
+        if len(returns) == 0:
+            return self._frame([])
+
+        if len(self._sums) == 1:
+            # Shifting by a typical value keeps the prefix sums of squares
+            # from cancelling catastrophically
+            self._shift = returns[0]
+        shifted = returns - self._shift
+        ends = len(self._sums) + np.arange(len(returns))
+        self._sums = np.concatenate(
+            [self._sums, self._sums[-1] + np.cumsum(shifted)]
+        )
+        self._squares = np.concatenate(
+            [self._squares, self._squares[-1] + np.cumsum(shifted**2)]
+        )
+
+        complete = ends >= max(self.windows.values())
+        columns = {"Date": self.first_date + positions[complete]}
+        for label, window in self.windows.items():
+            columns[f"{label} Volatility"] = self._std(ends[complete], window)
+        frame = pd.DataFrame(columns, index=positions[complete])
+        frame["Date"] = frame["Date"].astype(input_dates.dtype)
+        self._rows.append(frame)
+        return frame
+
+    @property
+    def surface(self):
+        """All rows of the surface computed so far."""
+        return pd.concat(self._rows) if self._rows else self._frame([])
+
+    def _std(self, ends, window):
+        sums = self._sums[ends] - self._sums[ends - window]
+        squares = self._squares[ends] - self._squares[ends - window]
+        variance = (squares - sums**2 / window) / (window - 1)
+        return np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS)
+
+    def _frame(self, index):
+        columns = ["Date"] + [f"{label} Volatility" for label in self.windows]
+        return pd.DataFrame(columns=columns, index=index)
@@ -12,3 +12,63 @@ def go_to_tmpdir(request):
     # Chdir only for the duration of the test.
     with tmpdir.as_cwd():
         yield
+
+
+@pytest.fixture(autouse=True)
+def market_cache_dir(monkeypatch, tmp_path):
+    """Keep the on-disk market data cache of every test apart."""
+    from finance import market_cache
+
+    directory = tmp_path / "market"
+    monkeypatch.setattr(market_cache, "MARKET_CACHE_DIR", str(directory))
+    return directory
+
+
+@pytest.fixture
+def evaluation_date():
+    """Pin QuantLib's evaluation date to a business day."""
+    import QuantLib as ql
+
+    settings = ql.Settings.instance()
+    previous = settings.evaluationDate
+    settings.evaluationDate = ql.Date(16, 10, 2024)
+    yield settings.evaluationDate
+    settings.evaluationDate = previous
+
+
+@pytest.fixture
+def curve(evaluation_date):
+    """A bootstrapped 6M Euribor curve built from synthetic quotes."""
+    import QuantLib as ql
+
+    calendar = ql.TARGET()
+    helpers = [
+        ql.DepositRateHelper(
+            ql.QuoteHandle(ql.SimpleQuote(0.035)),
+            ql.Period(6, ql.Months),
+            2,
+            calendar,
+            ql.Following,
+            False,
+            ql.Actual360(),
+        )
+    ]
+    for years, rate in [(1, 3.1), (2, 2.9), (5, 2.7), (10, 2.8), (30, 2.6)]:
+        helpers.append(
+            ql.SwapRateHelper(
+                ql.QuoteHandle(ql.SimpleQuote(rate / 100)),
+                ql.Period(years, ql.Years),
+                calendar,
+                ql.Annual,
+                ql.Unadjusted,
+                ql.Thirty360(ql.Thirty360.BondBasis),
+                ql.Euribor6M(),
+                ql.QuoteHandle(),
+                ql.Period(0, ql.Days),
+            )
+        )
+    curve = ql.PiecewiseLogCubicDiscount(
+        0, calendar, helpers, ql.Actual365Fixed()
+    )
+    curve.enableExtrapolation()
+    return curve
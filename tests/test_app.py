@@ -0,0 +1,127 @@
+from datetime import date
+
+import pytest
+import QuantLib as ql
+from fastapi.testclient import TestClient
+
+from finance import app as api
+
+
+@pytest.fixture
+def client(monkeypatch, curve):
+    requested = []
+
+    async def fake_curve(index):
+        requested.append(index)
+        return curve
+
+    monkeypatch.setattr(api.euribor, "curve", fake_curve)
+    client = TestClient(api.app)
+    client.requested = requested
+    return client
+
+
+def test_bulk_forward_rates(client, curve):
+    starts = [date(2025 + n // 12, n % 12 + 1, 15) for n in range(120)]
+    queries = [
+        {"index": "6M", "start": str(start), "tenor": "6M"} for start in starts
+    ] + [
+        {
+            "index": "3M",
+            "start": "2026-03-02",
+            "tenor": "1Y",
+            "day_count": "Thirty360",
+            "compounding": "Compounded",
+            "frequency": "Semiannual",
+        }
+    ]
+
+    response = client.post("/forward_rates", json={"queries": queries})
+
+    assert response.status_code == 200
+    assert sorted(client.requested) == ["3M", "6M"]
+    body = response.json()
+    assert len(body) == len(queries)
+    start = ql.Date(15, 1, 2025)
+    expected = curve.forwardRate(
+        start,
+        ql.TARGET().advance(start, ql.Period("6M")),
+        ql.Actual360(),
+        ql.Simple,
+    ).rate()
+    assert body[0] == {"time": "2025-01-15", "rate": pytest.approx(expected)}
+    start = ql.Date(2, 3, 2026)
+    expected = curve.forwardRate(
+        start,
+        ql.TARGET().advance(start, ql.Period("1Y")),
+        ql.Thirty360(ql.Thirty360.BondBasis),
+        ql.Compounded,
+        ql.Semiannual,
+    ).rate()
+    assert body[-1]["rate"] == pytest.approx(expected)
+
+
+def test_bulk_forward_rates_rejects_bad_tenor(client):
+    query = {"index": "6M", "start": "2025-01-01", "tenor": "soon"}
+
+    response = client.post("/forward_rates", json={"queries": [query]})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("tenor", ["0D", "0Y"])
+def test_bulk_forward_rates_rejects_zero_tenor(client, tenor):
+    query = {"index": "6M", "start": "2025-01-01", "tenor": tenor}
+
+    response = client.post("/forward_rates", json={"queries": [query]})
+
+    assert response.status_code == 422
+
+
+def test_bulk_forward_rates_rejects_start_before_reference_date(client):
+    queries = [
+        {"index": "6M", "start": "2025-01-01", "tenor": "6M"},
+        {"index": "6M", "start": "2020-01-01", "tenor": "6M"},
+    ]
+
+    response = client.post("/forward_rates", json={"queries": queries})
+
+    assert response.status_code == 422
+    assert "2024-10-16" in response.json()["detail"]
+
+
+def test_lambda_handler_keeps_state_across_invocations(client, monkeypatch):
+    calls = []
+
+    async def prewarm():
+        calls.append("prewarm")
+
+    async def close_db_pool():
+        calls.append("close")
+
+    monkeypatch.setattr(api.euribor, "prewarm", prewarm)
+    monkeypatch.setattr(api, "close_db_pool", close_db_pool)
+    event = {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": "/cache_stats",
+        "rawQueryString": "",
+        "headers": {"host": "api.example.com"},
+        "requestContext": {
+            "http": {
+                "method": "GET",
+                "path": "/cache_stats",
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "pytest",
+            },
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }
+
+    for _ in range(2):
+        response = api.handler(event, None)
+        assert response["statusCode"] == 200
+
+    assert calls == []
@@ -0,0 +1,98 @@
+import asyncio
+
+from finance.cache import CurveCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_curve_cache_serves_stale_while_revalidating():
+    clock = FakeClock()
+    cache = CurveCache(ttl=10, maxsize=2, clock=clock)
+    state = {"version": 1, "builds": 0}
+
+    async def build():
+        state["builds"] += 1
+        return f"curve-{state['version']}"
+
+    async def version():
+        return state["version"]
+
+    async def scenario():
+        assert await cache.get("6M", build, version) == "curve-1"
+        assert await cache.get("6M", build, version) == "curve-1"
+
+        # Expired but unchanged data: stale value, no rebuild
+        clock.now = 11
+        assert await cache.get("6M", build, version) == "curve-1"
+        await asyncio.sleep(0)
+        assert state["builds"] == 1
+
+        # Expired and changed data: stale value now, new value afterwards
+        clock.now = 22
+        state["version"] = 2
+        assert await cache.get("6M", build, version) == "curve-1"
+        await asyncio.sleep(0)
+        assert await cache.get("6M", build, version) == "curve-2"
+
+    asyncio.run(scenario())
+    assert state["builds"] == 2
+    assert cache.stats == {
+        "hits": 2,
+        "misses": 1,
+        "coalesced": 0,
+        "stale": 2,
+        "rebuilds": 1,
+    }
+
+
+def test_curve_cache_is_bounded():
+    cache = CurveCache(ttl=10, maxsize=2, clock=FakeClock())
+
+    async def version():
+        return 0
+
+    async def scenario():
+        for key in ["1M", "3M", "6M"]:
+
+            async def build(key=key):
+                return key
+
+            await cache.get(key, build, version)
+
+    asyncio.run(scenario())
+    assert list(cache._entries) == ["3M", "6M"]
+
+
+def test_curve_cache_refresh_rebuilds_only_on_new_data():
+    cache = CurveCache(ttl=10, maxsize=2, clock=FakeClock())
+    state = {"version": 1, "builds": 0}
+
+    async def build():
+        state["builds"] += 1
+        return f"curve-{state['version']}"
+
+    async def version():
+        return state["version"]
+
+    async def scenario():
+        # No entry yet: built in the background, without a miss
+        await cache.refresh("6M", build, version)
+        await cache.refresh("6M", build, version)
+        assert state["builds"] == 1
+        state["version"] = 2
+        await asyncio.gather(
+            cache.refresh("6M", build, version),
+            cache.refresh("6M", build, version),
+        )
+        assert await cache.get("6M", build, version) == "curve-2"
+
+    asyncio.run(scenario())
+    assert state["builds"] == 2
+    assert cache.stats["misses"] == 0
+    assert cache.stats["hits"] == 1
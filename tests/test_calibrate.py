@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+import QuantLib as ql
+
+from finance.calibrate import (
+    SURFACE_MATURITIES,
+    analytic_hw_volatility,
+    calibrate_to_fixings,
+    calibration_error,
+    fixings_error,
+    fixings_times,
+    simulate_hw_paths,
+)
+from finance.hull_white import hw_expectation_gradient, instantaneous_forwards
+
+
+@pytest.fixture
+def fixings():
+    dates = pd.date_range("2014-10-16", "2024-10-16")
+    years = np.arange(len(dates)) / 365.0
+    return pd.DataFrame({"date": dates, "rate": 0.02 + 0.01 * np.sin(years)})
+
+
+def quantlib_error(params, curve, fixings):
+    """The per-row objective this module replaces."""
+    process = ql.HullWhiteProcess(ql.YieldTermStructureHandle(curve), *params)
+    today = curve.referenceDate()
+    error = 0.0
+    for day, rate in zip(fixings["date"], fixings["rate"]):
+        date = ql.Date(day.day, day.month, day.year)
+        start, end = sorted([date, today])
+        t = ql.Actual365Fixed().yearFraction(start, end)
+        error += (process.expectation(0, 0, t) - rate) ** 2
+    return np.sqrt(error)
+
+
+def arrays(curve, fixings):
+    times = fixings_times(fixings["date"], curve.referenceDate())
+    forwards = instantaneous_forwards(curve, times)
+    (forward0,) = instantaneous_forwards(curve, [0.0])
+    return times, fixings["rate"].to_numpy(), forwards, forward0
+
+
+@pytest.mark.parametrize("params", [(0.03, 0.001), (0.2, 0.02), (0.0, 0.01)])
+def test_error_matches_quantlib_expectation(curve, fixings, params):
+    sample = fixings.iloc[::97]
+    error, _ = fixings_error(params, *arrays(curve, sample))
+
+    assert error == pytest.approx(quantlib_error(params, curve, sample))
+
+
+@pytest.mark.parametrize("params", [(0.03, 0.001), (1e-9, 0.01)])
+def test_gradient_matches_finite_differences(curve, fixings, params):
+    args = arrays(curve, fixings)
+    _, gradient = fixings_error(params, *args)
+
+    step = 1e-7
+    for i in range(2):
+        up, down = np.array(params), np.array(params)
+        up[i] += step
+        down[i] = max(down[i] - step, 0.0)
+        numeric = (
+            fixings_error(up, *args)[0] - fixings_error(down, *args)[0]
+        ) / (up[i] - down[i])
+        assert gradient[i] == pytest.approx(numeric, rel=1e-4, abs=1e-6)
+
+
+def test_small_mean_reversion_gradient_is_continuous():
+    times = np.linspace(0.0, 10.0, 11)
+    below = hw_expectation_gradient(0.03, times, 0.99e-8, 0.01)
+    above = hw_expectation_gradient(0.03, times, 1.01e-8, 0.01)
+
+    np.testing.assert_allclose(below, above, rtol=1e-6, atol=1e-12)
+
+
+def test_calibration_reaches_the_quantlib_optimum(curve, fixings):
+    result = calibrate_to_fixings(curve, fixings)
+
+    assert result.success
+    best = quantlib_error(result.x, curve, fixings)
+    for a, sigma in [(0.03, 0.001), result.x * 1.1, result.x * 0.9]:
+        assert best <= quantlib_error((a, sigma), curve, fixings)
+
+
+def test_analytic_volatility_matches_simulation(curve):
+    model = ql.HullWhite(ql.YieldTermStructureHandle(curve), 0.05, 0.001)
+    maturities = [1, 5, 20]
+
+    analytic = analytic_hw_volatility(0.05, 0.001, curve, maturities)
+    simulated = [
+        simulate_hw_paths(model, curve, years, num_paths=20000, seed=3)
+        for years in maturities
+    ]
+
+    np.testing.assert_allclose(analytic, simulated, rtol=0.03)
+
+
+def test_calibration_error_methods(curve):
+    model = ql.HullWhite(ql.YieldTermStructureHandle(curve), 0.05, 0.001)
+    surface = pd.DataFrame(
+        {f"{years}Y Volatility": [0.3, 0.4] for years in SURFACE_MATURITIES}
+    )
+
+    analytic = calibration_error(
+        [0.05, 0.001], model, curve, surface, method="analytic"
+    )
+    simulated = calibration_error([0.05, 0.001], model, curve, surface)
+
+    assert analytic == calibration_error(
+        [0.05, 0.001], model, curve, surface, "analytic"
+    )
+    assert np.isfinite(simulated)
+    assert list(model.params()) == [0.05, 0.001]
+    with pytest.raises(ValueError):
+        calibration_error([0.05, 0.001], model, curve, surface, "bogus")
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance import calibration_cache
+from finance.calibration_cache import CalibrationCache
+
+
+@pytest.fixture
+def fixings():
+    dates = pd.date_range("2014-10-16", "2024-10-16")
+    years = np.arange(len(dates)) / 365.0
+    return pd.DataFrame({"date": dates, "rate": 0.02 + 0.01 * np.sin(years)})
+
+
+def test_unchanged_inputs_hit_the_cache(curve, fixings, tmpdir):
+    first = CalibrationCache(str(tmpdir)).calibrate("6M", curve, fixings)
+    cache = CalibrationCache(str(tmpdir))
+    second = cache.calibrate("6M", curve, fixings)
+
+    assert second == first
+    assert cache.stats["hits"] == 1
+    assert cache.stats["iterations"] == 0
+
+
+def test_small_changes_warm_start(curve, fixings, tmpdir, monkeypatch):
+    cold = CalibrationCache(str(tmpdir / "cold"))
+    warm = CalibrationCache(str(tmpdir / "warm"))
+    warm.calibrate("6M", curve, fixings.iloc[:-5])
+
+    extended = [
+        cache.calibrate("6M", curve, fixings) for cache in [cold, warm]
+    ]
+
+    assert extended[1] == pytest.approx(extended[0], rel=1e-3)
+    assert warm.stats["warm_starts"] == 1
+    assert warm.stats["last_iterations"] < cold.stats["last_iterations"]
+
+
+def test_large_changes_start_cold(curve, fixings, tmpdir):
+    cache = CalibrationCache(str(tmpdir))
+    cache.calibrate("6M", curve, fixings.iloc[:1000])
+    cache.calibrate("6M", curve, fixings)
+
+    assert cache.stats["misses"] == 2
+    assert cache.stats["warm_starts"] == 0
+
+
+def test_unwritable_cache_is_skipped(curve, fixings, tmp_path, capsys):
+    # A file where the directory should be, like a read-only file system
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    cache = CalibrationCache(str(blocked))
+
+    first = cache.calibrate("6M", curve, fixings)
+
+    assert cache.calibrate("6M", curve, fixings) == first
+    assert cache.stats["misses"] == 2
+    assert "Error writing calibration cache" in capsys.readouterr().out
+
+
+def test_key_follows_the_fixings(curve, fixings):
+    key = calibration_cache.calibration_key(curve, fixings)
+    shifted = fixings.assign(rate=fixings["rate"] + 1e-6)
+
+    assert key == calibration_cache.calibration_key(curve, fixings)
+    assert key != calibration_cache.calibration_key(curve, shifted)
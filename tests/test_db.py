@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from finance import db
+
+
+class FakeCursor:
+    """Answers queries like a Postgres cursor from a fixed table."""
+
+    def __init__(self, server):
+        self.server = server
+        self.description = None
+        self._rows = []
+
+    async def execute(self, query, args=None):
+        self.server.statements.append((query, args))
+        self._rows = []
+        self.description = None
+        if query.startswith("DECLARE"):
+            self.server.position = 0
+        elif query.startswith("FETCH"):
+            size = int(query.split()[2])
+            position = self.server.position
+            end = position + size
+            self._rows = self.server.rows[position:end]
+            self.server.position += size
+        elif query.startswith(("SELECT", "EXECUTE")):
+            self._rows = self.server.rows
+        else:
+            return
+        self.description = [(column,) for column in self.server.columns]
+
+    async def fetchall(self):
+        return list(self._rows)
+
+
+class FakePool:
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.statements = []
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        # The pool stands in for its single connection too
+        yield self
+
+    @contextlib.asynccontextmanager
+    async def cursor(self):
+        yield FakeCursor(self)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    rows = [
+        (date(2024, 1, 1) + timedelta(days=n), Decimal("3.5"))
+        for n in range(25)
+    ]
+    rows[3] = (rows[3][0], None)
+    pool = FakePool(["date", "rate"], rows)
+    monkeypatch.setattr(db, "pool", pool)
+    monkeypatch.setattr(db, "_prepared", {})
+    return pool
+
+
+def test_fetch_columns_are_typed(pool):
+    columns = asyncio.run(db.fetch_columns("SELECT date, rate FROM fixings"))
+
+    assert list(columns) == ["date", "rate"]
+    assert columns["date"].dtype == np.dtype("datetime64[D]")
+    assert columns["date"][0] == np.datetime64("2024-01-01")
+    assert columns["rate"].dtype == float
+    assert np.isnan(columns["rate"][3])
+    assert columns["rate"][4] == 3.5
+
+
+def test_prepared_statements_are_prepared_once_per_connection(pool):
+    query = "SELECT date, rate FROM fixings WHERE rate > %s AND x LIKE 'a%%'"
+
+    async def run():
+        for _ in range(3):
+            await db.fetch(query, (1.0,), prepared=True)
+
+    asyncio.run(run())
+
+    statements = [statement for statement, _ in pool.statements]
+    assert len(statements) == 4
+    name = statements[1].split()[1]
+    assert statements[0] == (
+        f"PREPARE {name} AS SELECT date, rate FROM fixings "
+        "WHERE rate > $1 AND x LIKE 'a%'"
+    )
+    assert pool.statements[1:] == [(f"EXECUTE {name} (%s)", (1.0,))] * 3
+
+
+def test_fetch_batches_streams_through_a_cursor(pool):
+    async def run():
+        return [
+            batch
+            async for batch in db.fetch_batches(
+                "SELECT date, rate FROM fixings", batch_size=10
+            )
+        ]
+
+    batches = asyncio.run(run())
+
+    assert [len(batch["rate"]) for batch in batches] == [10, 10, 5]
+    assert batches[2]["date"][-1] == np.datetime64("2024-01-25")
+    statements = [statement for statement, _ in pool.statements]
+    assert statements[0] == "BEGIN"
+    assert statements[-1] == "COMMIT"
+    assert statements.count("FETCH FORWARD 10 FROM finance_batches") == 3
+
+
+def test_backend_replaces_the_database(monkeypatch):
+    queries = []
+
+    async def backend(query, args=None):
+        queries.append((query, args))
+        return ["date", "rate"], [(date(2024, 1, 1), 3.5)] * 5
+
+    monkeypatch.setattr(db, "pool", None)
+    db.use_backend(backend)
+    try:
+        columns = asyncio.run(db.fetch_columns("SELECT 1", prepared=True))
+        frame = asyncio.run(db.query_db("SELECT 2"))
+
+        async def batches():
+            return [
+                len(batch["rate"])
+                async for batch in db.fetch_batches("SELECT 3", (1,), None, 2)
+            ]
+
+        sizes = asyncio.run(batches())
+    finally:
+        db.use_backend(None)
+
+    assert columns["date"].dtype == np.dtype("datetime64[D]")
+    assert len(frame) == 5
+    assert sizes == [2, 2, 1]
+    assert queries == [
+        ("SELECT 1", None),
+        ("SELECT 2", None),
+        ("SELECT 3", (1,)),
+    ]
@@ -0,0 +1,314 @@
+import asyncio
+import re
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+import QuantLib as ql
+from fastapi.testclient import TestClient
+
+from finance import app as api
+from finance import (
+    euribor,
+    euribor_3m,
+    executor,
+    fixings,
+    market_cache,
+    market_data,
+)
+from finance.cache import CurveCache
+from finance.db import to_columns
+from finance import live_curve
+from finance.live_curve import LiveCurve
+
+EVALUATION_DATE = date(2024, 10, 16)
+
+
+class FakeDatabase:
+    """Stands in for ``query_db`` and records every query it receives."""
+
+    def __init__(self):
+        self.queries = []
+        self.arguments = []
+        days = [EVALUATION_DATE - timedelta(days=n) for n in range(120, 0, -1)]
+        self.fixings = pd.DataFrame(
+            {"date": days, "rate": [3.5 - 0.001 * n for n in range(120)]}
+        )
+        self.swaps = pd.DataFrame(
+            {
+                "index_name": "EURIBOR",
+                "tenor": ["1Y", "2Y", "5Y", "10Y", "20Y", "30Y"],
+                "rate": [3.1, 2.9, 2.7, 2.8, 2.9, 2.8],
+            }
+        )
+
+    async def query_db(self, query, args=None):
+        self.queries.append(query)
+        self.arguments.append(args)
+        await asyncio.sleep(0.01)
+        if "UNION ALL" in query:
+            return self.snapshot(query, args)
+        if "taxa_fixa_swap_rates_real_time" in query:
+            return self.swaps.copy()
+        starting_at = re.search(r"\"date\">'([0-9-]+)'", query)
+        if starting_at:
+            newer = self.fixings["date"] > date.fromisoformat(starting_at[1])
+            return self.fixings[newer].reset_index(drop=True)
+        return self.fixings.copy()
+
+    def snapshot(self, query, args):
+        """Swap quotes and new fixings of every index of the query."""
+        quoted = re.search(r"\"index\" IN \(([^)]*)\)", query)[1]
+        dates = iter(args or [])
+        frames = []
+        for index in re.findall(r"'(\w+)'", quoted):
+            frames.append(
+                self.swaps.assign(kind="swap", index=index, date=None)
+            )
+            new = self.fixings
+            if f'"index"=\'{index}\' AND "date">%s' in query:
+                new = new[new["date"] > next(dates)]
+            frames.append(new.assign(kind="fixing", index=index, tenor=None))
+        columns = ["kind", "index", "tenor", "date", "rate"]
+        return pd.concat(frames)[columns]
+
+    async def fetch(self, query, args=None, prepared=False):
+        result = await self.query_db(query, args)
+        return list(result.columns), list(result.itertuples(index=False))
+
+    async def fetch_columns(
+        self, query, args=None, dtypes=None, prepared=False
+    ):
+        return to_columns(*await self.fetch(query, args), dtypes)
+
+
+@pytest.fixture
+def database(monkeypatch, evaluation_date):
+    fake = FakeDatabase()
+    monkeypatch.setattr(fixings, "fetch_columns", fake.fetch_columns)
+    monkeypatch.setattr(market_data, "fetch_columns", fake.fetch_columns)
+    monkeypatch.setattr(fixings, "_stores", {})
+    monkeypatch.setattr(euribor, "_cache", CurveCache(ttl=60))
+    monkeypatch.setattr(
+        euribor, "_snapshots", {"loading": None, "latest": None}
+    )
+    return fake
+
+
+def test_concurrent_curve_calls_share_one_build(database):
+    async def burst():
+        return await asyncio.gather(*[euribor.curve("6M") for _ in range(50)])
+
+    curves = asyncio.run(burst())
+
+    assert all(curve is curves[0] for curve in curves)
+    # One snapshot query serves the data version and the bootstrap
+    assert len(database.queries) == 1
+    assert "UNION ALL" in database.queries[0]
+    assert euribor.cache_stats()["misses"] == 1
+    assert euribor.cache_stats()["coalesced"] == 49
+    assert 0 < curves[0].discount(10.0) < 1
+
+
+def test_curves_share_one_market_snapshot(database):
+    async def build_all():
+        return await asyncio.gather(*map(euribor.curve, ["1M", "3M", "6M"]))
+
+    asyncio.run(build_all())
+    assert len(database.queries) == 1
+
+    database.fixings.loc[len(database.fixings)] = [EVALUATION_DATE, 3.6]
+
+    async def refresh_all():
+        await asyncio.gather(*map(euribor.refresh, ["1M", "3M", "6M"]))
+
+    asyncio.run(refresh_all())
+
+    assert len(database.queries) == 2
+    # Only fixings newer than those already loaded are read again
+    assert database.arguments[1] == [date(2024, 10, 15)] * 3
+    assert euribor.cache_stats()["rebuilds"] == 3
+    assert fixings.fixings_store("6M", "EURIBOR").last_rate == 3.6
+
+
+def test_cold_start_reads_the_market_cache(database, monkeypatch):
+    async def build():
+        return await euribor.curve("6M")
+
+    reference = asyncio.run(build()).discount(10.0)
+
+    # A new process: nothing in memory, the files are still there
+    monkeypatch.setattr(fixings, "_stores", {})
+    monkeypatch.setattr(euribor, "_cache", CurveCache(ttl=60))
+    assert asyncio.run(build()).discount(10.0) == pytest.approx(reference)
+    assert database.arguments[-1] == [date(2024, 10, 15)] * 3
+
+    # Offline, without any database
+    monkeypatch.setattr(fixings, "_stores", {})
+    monkeypatch.setattr(euribor, "_cache", CurveCache(ttl=60))
+    monkeypatch.setattr(market_cache, "OFFLINE", True)
+    queries = len(database.queries)
+    assert asyncio.run(build()).discount(10.0) == pytest.approx(reference)
+    assert len(database.queries) == queries
+
+
+def test_curves_build_when_the_market_cache_is_unwritable(
+    database, monkeypatch, tmp_path
+):
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    monkeypatch.setattr(market_cache, "MARKET_CACHE_DIR", str(blocked))
+
+    curve = asyncio.run(euribor.curve("6M"))
+
+    assert 0 < curve.discount(10.0) < 1
+
+
+def test_live_curve_updates_quotes_in_place(database):
+    async def build():
+        return await euribor.curve("3M")
+
+    first = asyncio.run(build())
+    live = euribor_3m._curve.curve
+    before = first.discount(10.0)
+
+    euribor._cache.invalidate()
+    database.swaps["rate"] = database.swaps["rate"] + 0.5
+    second = asyncio.run(build())
+
+    # The helpers are reused, but curves already served keep their data
+    assert euribor_3m._curve.curve is live
+    assert second is not first
+    assert first.discount(10.0) == before
+    assert second.discount(10.0) < before
+    assert live.discount(10.0) == pytest.approx(second.discount(10.0))
+
+
+def test_served_curves_are_not_torn_by_rebuilds(evaluation_date):
+    live = LiveCurve(ql.Euribor6M(), ql.Period(6, ql.Months))
+    swaps = {"tenor": ["1Y", "5Y", "10Y", "30Y"], "rate": [3.1, 2.7, 2.8, 2.6]}
+    moved = {"tenor": swaps["tenor"], "rate": [4.1, 3.7, 3.8, 3.6]}
+    served = live.node_curve(*live.nodes(swaps, 3.5))
+    times = np.linspace(0.0, 30.0, 2000)
+    expected = [served.discount(t) for t in times]
+    done = threading.Event()
+
+    def rebuild():
+        for n in range(200):
+            live.nodes(moved if n % 2 else swaps, 3.5)
+        done.set()
+
+    rebuilder = threading.Thread(target=rebuild)
+    rebuilder.start()
+    try:
+        while not done.is_set():
+            assert [served.discount(t) for t in times] == expected
+    finally:
+        rebuilder.join()
+
+
+def test_curves_are_rebuilt_when_the_evaluation_date_moves(
+    database, evaluation_date
+):
+    built = asyncio.run(euribor.curve("6M"))
+    ql.Settings.instance().evaluationDate = ql.Date(17, 10, 2024)
+    asyncio.run(euribor.refresh("6M"))
+    moved = asyncio.run(euribor.curve("6M"))
+
+    assert euribor.cache_stats()["rebuilds"] == 1
+    assert built.referenceDate() == ql.Date(16, 10, 2024)
+    assert moved.referenceDate() == ql.Date(17, 10, 2024)
+
+
+def test_fixings_are_loaded_incrementally(database, monkeypatch):
+    monkeypatch.setattr(fixings, "_stores", {})
+    loaded = []
+    add_fixings = fixings.add_fixings_to_curve
+
+    def add_fixings_to_curve(calendar, deposit_rate, all_fixings):
+        loaded.append(len(all_fixings["date"]))
+        return add_fixings(calendar, deposit_rate, all_fixings)
+
+    monkeypatch.setattr(fixings, "add_fixings_to_curve", add_fixings_to_curve)
+
+    index = ql.Euribor6M()
+    calendar = ql.TARGET()
+    load = fixings.apply_fixings
+
+    asyncio.run(load("6M", calendar, index, "EURIBOR"))
+    asyncio.run(load("6M", calendar, index, "EURIBOR"))
+    database.fixings.loc[len(database.fixings)] = [EVALUATION_DATE, 3.6]
+    rate = asyncio.run(load("6M", calendar, index, "EURIBOR"))
+
+    assert loaded == [120, 1]
+    assert rate == 3.6
+    assert index.fixing(ql.Date(16, 10, 2024)) == pytest.approx(0.036)
+
+
+def worker_fixing(tenor, serial):
+    """A fixing as the live curve of a worker process sees it."""
+    index = live_curve._worker_curves[tenor].deposit_rate
+    return index.fixing(ql.Date(serial))
+
+
+@pytest.mark.parametrize("kind", ["inline", "process"])
+def test_curves_match_across_executors(database, monkeypatch, kind):
+    async def rebuild():
+        await euribor.refresh("6M")
+        return await euribor.curve("6M")
+
+    # Forked workers inherit the fixings earlier tests left in the index
+    ql.Euribor6M().clearFixings()
+    today = ql.Settings.instance().evaluationDate.serialNumber()
+    monkeypatch.setattr(executor, "EXECUTOR", kind)
+    monkeypatch.setattr(executor, "EXECUTOR_WORKERS", 1)
+    try:
+        asyncio.run(euribor.curve("6M"))
+        # Today's fixing, which the first coupon of every swap uses, comes
+        # in after the workers started
+        database.fixings.loc[len(database.fixings)] = [EVALUATION_DATE, 3.6]
+        built = asyncio.run(rebuild())
+        if kind == "process":
+            worker = executor.get_executor(kind)
+            fixing = worker.submit(worker_fixing, "6M", today).result()
+            assert fixing == pytest.approx(0.036)
+    finally:
+        executor.shutdown_executors()
+    monkeypatch.setattr(executor, "EXECUTOR", "inline")
+    euribor._cache.invalidate()
+    reference = asyncio.run(euribor.curve("6M"))
+
+    assert euribor.cache_stats()["rebuilds"] == 1
+    for t in [0.5, 1.0, 7.3, 25.0]:
+        assert built.discount(t) == pytest.approx(reference.discount(t))
+
+
+def test_app_prewarms_and_refreshes_curves(database, monkeypatch):
+    closed = []
+
+    async def close_db_pool():
+        closed.append(True)
+
+    monkeypatch.setattr(api, "close_db_pool", close_db_pool)
+    monkeypatch.setattr(euribor, "CURVE_REFRESH_INTERVAL", 0.05)
+
+    with TestClient(api.app) as client:
+        assert euribor.cache_stats()["misses"] == 3
+
+        database.swaps["rate"] = database.swaps["rate"] + 0.5
+        deadline = time.monotonic() + 5
+        while euribor.cache_stats()["rebuilds"] < 3:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        response = client.get("/forward_curve", params={"index": "6M"})
+        assert response.status_code == 200
+        stats = euribor.cache_stats()
+        assert stats["misses"] == 3
+        assert stats["hits"] == 1
+        assert closed == []
+
+    assert closed == [True]
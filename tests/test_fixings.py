@@ -0,0 +1,52 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+import QuantLib as ql
+
+from finance.dates import is_business_day
+from finance.fixings import add_fixings_to_curve
+
+
+def make_index(name):
+    return ql.IborIndex(
+        name,
+        ql.Period(6, ql.Months),
+        2,
+        ql.EURCurrency(),
+        ql.TARGET(),
+        ql.ModifiedFollowing,
+        False,
+        ql.Actual360(),
+    )
+
+
+def test_add_fixings_to_curve_keeps_business_days_only():
+    calendar = ql.TARGET()
+    start = date(1998, 12, 20)
+    days = [start + timedelta(days=n) for n in range(3000)]
+    fixings = pd.DataFrame(
+        {"date": days, "rate": [1 + n / 1000 for n in range(3000)]}
+    )
+    index = make_index("FixingsTest")
+
+    last_rate = add_fixings_to_curve(calendar, index, fixings)
+
+    expected = [
+        (ql.Date(d.day, d.month, d.year), rate / 100)
+        for d, rate in zip(fixings["date"], fixings["rate"])
+        if calendar.isBusinessDay(ql.Date(d.day, d.month, d.year))
+    ]
+    series = index.timeSeries()
+    assert list(zip(series.dates(), series.values())) == expected
+    assert last_rate == pytest.approx(expected[-1][1] * 100)
+
+
+def test_is_business_day_outside_precomputed_range():
+    calendar = ql.TARGET()
+    days = [ql.Date(25, 12, 1960), ql.Date(3, 1, 2101), ql.Date(4, 1, 2101)]
+    ordinals = pd.Series([d.serialNumber() - 25569 for d in days])
+
+    assert list(is_business_day(calendar, ordinals.to_numpy())) == [
+        calendar.isBusinessDay(d) for d in days
+    ]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import QuantLib as ql
+
+from finance.hull_white import (
+    hw_alpha,
+    instantaneous_forwards,
+    ou_paths,
+    simulate_short_rates,
+    sobol_normals,
+    standard_normals,
+)
+
+A, SIGMA = 0.05, 0.01
+
+
+@pytest.fixture
+def times():
+    return np.linspace(0.0, 30.0, 30 * 12 + 1)
+
+
+def test_paths_match_hull_white_moments(curve, times):
+    rates = simulate_short_rates(curve, A, SIGMA, times, 20000, seed=7)
+
+    process = ql.HullWhiteProcess(ql.YieldTermStructureHandle(curve), A, SIGMA)
+    for step in [12, 120, 360]:
+        t = times[step]
+        assert rates[:, step].mean() == pytest.approx(
+            process.expectation(0, process.x0(), t), abs=3e-4
+        )
+        assert rates[:, step].std() == pytest.approx(
+            process.stdDeviation(0, process.x0(), t), rel=0.03
+        )
+
+
+def test_antithetic_paths_average_to_the_drift(curve, times):
+    rates = simulate_short_rates(
+        curve, A, SIGMA, times, 10, seed=1, antithetic=True
+    )
+
+    alpha = hw_alpha(instantaneous_forwards(curve, times), times, A, SIGMA)
+    np.testing.assert_allclose(rates.mean(axis=0), alpha, atol=1e-15)
+
+
+def test_paths_are_reproducible(curve, times):
+    first = simulate_short_rates(curve, A, SIGMA, times, 5, seed=3)
+    second = simulate_short_rates(curve, A, SIGMA, times, 5, seed=3)
+    single = simulate_short_rates(
+        curve, A, SIGMA, times, 5, seed=3, dtype=np.float32
+    )
+
+    np.testing.assert_array_equal(first, second)
+    assert single.dtype == np.float32
+
+
+def test_cumulative_scheme_matches_recursion(times, monkeypatch):
+    normals = standard_normals(4, len(times) - 1, seed=0)
+    vectorized = ou_paths(0.3, SIGMA, times, normals)
+
+    monkeypatch.setattr("finance.hull_white._MAX_DECAY_EXPONENT", 0.0)
+    recursive = ou_paths(0.3, SIGMA, times, normals)
+
+    np.testing.assert_allclose(vectorized, recursive, atol=1e-14)
+
+
+def test_sobol_normals_build_a_brownian_motion(times):
+    normals = sobol_normals(4096, times, seed=3)
+
+    assert normals.shape == (4096, len(times) - 1)
+    assert np.abs(normals.mean(axis=0)).max() < 0.01
+    # W(T) is driven by the first Sobol dimension alone
+    terminal = normals.sum(axis=1) * np.sqrt(times[1])
+    assert terminal.std() == pytest.approx(np.sqrt(times[-1]), rel=1e-3)
+    np.testing.assert_array_equal(normals, sobol_normals(4096, times, seed=3))
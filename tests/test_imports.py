@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from pathlib import Path
+
+# Modules the API must not load on a cold start: plotting, scipy, pandas,
+# pyarrow and the calibration and simulation code
+HEAVY_MODULES = [
+    "matplotlib",
+    "pandas",
+    "pyarrow",
+    "scipy",
+    "finance.calibrate",
+    "finance.scenarios",
+]
+
+
+def import_times(module):
+    """Cumulative import time of every module loaded by ``module``."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parents[1],
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_api_defers_heavy_modules():
+    # The import time itself is checked by benchmarks.bench_import
+    times = import_times("finance.app")
+
+    assert [module for module in HEAVY_MODULES if module in times] == []
+
+
+def test_cli_defers_the_simulation_stack():
+    times = import_times("finance.cli")
+
+    assert [module for module in HEAVY_MODULES if module in times] == []
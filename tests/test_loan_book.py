@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance.loan_book import book_horizon, load_loan_book, price_loan_book
+from finance.mortgage import amortize
+
+TIMES = np.linspace(0.0, 30.0, 30 * 12 + 1)
+
+
+@pytest.fixture
+def rates():
+    rng = np.random.default_rng(0)
+    steps = rng.normal(0, 0.001, (50, len(TIMES)))
+    return 0.03 + np.cumsum(steps, axis=1)
+
+
+@pytest.fixture
+def book():
+    return pd.DataFrame(
+        {
+            "loan_id": ["a", "b", "c", "d"],
+            "principal": [145000, 80000, 250000, 50000],
+            "years": [30, 10, 20, 10],
+            "start_date": pd.to_datetime(
+                ["2024-10-16", "2025-01-01", "2026-06-30", "2024-12-05"]
+            ),
+            "spread": [0.01, 0.015, 0.0, 0.02],
+        }
+    )
+
+
+def test_loans_match_single_loan_amortization(book, rates):
+    priced = price_loan_book(book, rates, TIMES, "2024-10-16")
+
+    for loan, months in zip(book.itertuples(), [0, 3, 20, 2]):
+        _, payments, _ = amortize(
+            rates, TIMES, loan.principal, loan.years, loan.spread, months / 12
+        )
+        totals = payments.sum(axis=1)
+        row = priced.loc[loan.loan_id]
+        assert row["total_paid_mean"] == pytest.approx(totals.mean())
+        assert row["total_paid_std"] == pytest.approx(totals.std(ddof=1))
+        assert row["total_paid_p95"] == pytest.approx(
+            np.percentile(totals, 95)
+        )
+        assert row["max_payment_p50"] == pytest.approx(
+            np.percentile(payments.max(axis=1), 50)
+        )
+
+
+def test_chunking_does_not_change_results(book, rates):
+    whole = price_loan_book(book, rates, TIMES, "2024-10-16")
+    chunked = price_loan_book(book, rates, TIMES, "2024-10-16", chunk_bytes=1)
+
+    pd.testing.assert_frame_equal(chunked, whole)
+
+
+def test_load_loan_book_from_csv(book, rates):
+    book.drop(columns="spread").to_csv("book.csv", index=False)
+
+    loaded = load_loan_book("book.csv")
+
+    assert list(loaded["spread"]) == [0.0] * 4
+    assert loaded["start_date"].dtype.kind == "M"
+    priced = price_loan_book(loaded, rates, TIMES, "2024-10-16")
+    assert list(priced.index) == ["a", "b", "c", "d"]
+
+
+def test_invalid_books(book, rates):
+    book[["loan_id", "principal"]].to_csv("book.csv", index=False)
+    with pytest.raises(ValueError, match="missing columns"):
+        load_loan_book("book.csv")
+    with pytest.raises(ValueError, match="before the scenarios"):
+        price_loan_book(book, rates, TIMES, "2025-01-01")
+
+
+def test_grid_sized_by_book_horizon_prices_loans_ending_late(book):
+    book.loc[2, "years"] = 30
+    flat = np.full((5, len(TIMES)), 0.03)
+    with pytest.raises(ValueError, match="before the loan ends"):
+        price_loan_book(book, flat, TIMES, "2024-10-16")
+
+    horizon = book_horizon(book, "2024-10-16")
+    times = np.linspace(0.0, horizon, int(horizon * 12) + 1)
+    priced = price_loan_book(
+        book, np.full((5, len(times)), 0.03), times, "2024-10-16"
+    )
+
+    assert horizon == pytest.approx(30 + 20 / 12)
+    assert np.isfinite(priced.to_numpy()).all()
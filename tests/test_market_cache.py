@@ -0,0 +1,87 @@
+import tempfile
+from datetime import date
+
+import numpy as np
+import pytest
+
+from finance import market_cache
+
+
+def fixings(*days):
+    return {
+        "date": np.array(days, dtype="datetime64[D]"),
+        "rate": np.arange(len(days), dtype=float),
+    }
+
+
+@pytest.mark.parametrize("parquet", [True, False])
+def test_columns_round_trip(monkeypatch, parquet):
+    if not parquet:
+        monkeypatch.setattr(market_cache, "PARQUET", False)
+    elif not market_cache.PARQUET:
+        pytest.skip("pyarrow is not installed")
+    columns = {
+        "tenor": np.array(["1Y", "10Y"]),
+        "date": np.array(["2024-01-01", "NaT"], dtype="datetime64[D]"),
+        "rate": np.array([2.5, 3.0]),
+    }
+
+    market_cache.write_columns("example", columns)
+    read = market_cache.read_columns("example")
+
+    assert list(read) == list(columns)
+    for name, values in columns.items():
+        assert read[name].dtype == values.dtype
+        np.testing.assert_array_equal(read[name], values)
+    assert market_cache.read_columns("missing") is None
+
+
+def test_fixings_are_extended_without_gaps():
+    cached = fixings("2024-01-01", "2024-01-02")
+    market_cache.write_columns("fixings_EURIBOR_6M", cached)
+
+    assert market_cache.fixings_since(cached) == date(2024, 1, 2)
+    assert market_cache.fixings_since(cached, date(2024, 3, 1)) == date(
+        2024, 3, 1
+    )
+
+    # Rows after a later date would leave a hole: returned, not stored
+    after = market_cache.update_fixings(
+        "EURIBOR", "6M", None, fixings("2024-03-04"), date(2024, 3, 1)
+    )
+    assert len(after["date"]) == 1
+    assert len(market_cache.read_fixings("EURIBOR", "6M")["date"]) == 2
+
+    after = market_cache.update_fixings(
+        "EURIBOR", "6M", None, fixings("2024-01-03"), date(2024, 1, 1)
+    )
+    np.testing.assert_array_equal(
+        after["date"],
+        np.array(["2024-01-02", "2024-01-03"], dtype="datetime64[D]"),
+    )
+    stored = market_cache.read_fixings("EURIBOR", "6M")
+    assert stored["date"][-1] == np.datetime64("2024-01-03")
+
+
+def test_unwritable_cache_is_skipped(monkeypatch, tmp_path, capsys):
+    # A file where the directory should be, like a read-only file system
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    monkeypatch.setattr(market_cache, "MARKET_CACHE_DIR", str(blocked))
+
+    fetched = fixings("2024-01-01", "2024-01-02")
+    merged = market_cache.update_fixings("EURIBOR", "6M", None, fetched)
+    swaps = {"tenor": np.array(["1Y"]), "rate": np.array([3.0])}
+    market_cache.write_swaps("EURIBOR", "6M", swaps)
+
+    np.testing.assert_array_equal(merged["date"], fetched["date"])
+    assert market_cache.read_fixings("EURIBOR", "6M") is None
+    assert "Error writing market cache" in capsys.readouterr().out
+
+
+def test_lambda_caches_under_the_temporary_directory(monkeypatch):
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "taxa-fixa-api")
+
+    directory = market_cache.default_cache_dir()
+
+    assert directory.startswith(tempfile.gettempdir())
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from finance.mortgage import (
+    amortize,
+    calculate_mortgage_payments,
+    monthly_rates,
+)
+
+TIMES = np.linspace(0.0, 30.0, 30 * 52 + 1)
+
+
+def test_constant_rate_is_a_classic_annuity():
+    rates = np.full((3, len(TIMES)), 0.03)
+    annual, payments, balances = amortize(rates, TIMES, 145000, 30, 0.01)
+
+    monthly = 0.04 / 12
+    annuity = 145000 * monthly / (1 - (1 + monthly) ** -360)
+    np.testing.assert_allclose(annual, 0.04)
+    np.testing.assert_allclose(payments, annuity)
+    assert balances.shape == (3, 360)
+    assert balances[:, -1] == pytest.approx(0.0, abs=1e-6)
+    np.testing.assert_allclose(
+        balances[:, 0], 145000 * (1 + monthly) - annuity
+    )
+
+
+def test_zero_rate_repays_in_equal_parts():
+    _, payments, balances = amortize(np.zeros((1, len(TIMES))), TIMES, 1200, 1)
+
+    np.testing.assert_allclose(payments, 100.0)
+    np.testing.assert_allclose(balances[0, :3], [1100, 1000, 900])
+
+
+def test_payments_follow_a_loop_over_months():
+    rng = np.random.default_rng(0)
+    rates = 0.03 + np.cumsum(rng.normal(0, 0.001, (4, len(TIMES))), axis=1)
+    annual, payments, balances = amortize(rates, TIMES, 1e5, 10, start=2.0)
+
+    for path in range(4):
+        balance = 1e5
+        for month in range(120):
+            m = annual[path, month] / 12
+            n = 120 - month
+            payment = balance * m / (1 - (1 + m) ** -n)
+            balance -= payment - balance * m
+            assert payments[path, month] == pytest.approx(payment)
+            assert balances[path, month] == pytest.approx(balance, abs=1e-6)
+
+
+def test_monthly_rates_average_over_each_month():
+    times = np.linspace(0.0, 2.0, 25)
+    rates = np.tile(times, (2, 1))
+
+    averages = monthly_rates(rates, times, 12, start=0.5)
+
+    np.testing.assert_allclose(averages[0], 0.5 + (np.arange(12) + 0.5) / 12)
+    with pytest.raises(ValueError):
+        monthly_rates(rates, times, 24, start=0.5)
+
+
+def test_single_path_wrapper():
+    times, payments = calculate_mortgage_payments(
+        np.full(len(TIMES), 0.02), TIMES, 1e5, 5
+    )
+
+    assert len(times) == len(payments) == 60
+    assert times[1] == pytest.approx(1 / 12)
@@ -0,0 +1,161 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from finance import scenarios
+from finance.hull_white import hw_alpha, hw_std, instantaneous_forwards
+from finance.mortgage import amortize
+from finance.scenarios import run_scenarios, sample_paths
+
+A, SIGMA = 0.05, 0.01
+TIMES = np.linspace(0.0, 10.0, 121)
+
+
+def test_results_do_not_depend_on_worker_count(curve):
+    serial = run_scenarios(
+        curve,
+        A,
+        SIGMA,
+        TIMES,
+        900,
+        seed=5,
+        shard_size=200,
+        keep_terminal=True,
+    )
+    parallel = run_scenarios(
+        curve,
+        A,
+        SIGMA,
+        TIMES,
+        900,
+        seed=5,
+        workers=2,
+        shard_size=200,
+        keep_terminal=True,
+    )
+
+    np.testing.assert_array_equal(serial.histogram, parallel.histogram)
+    np.testing.assert_array_equal(serial.mean, parallel.mean)
+    np.testing.assert_array_equal(serial.m2, parallel.m2)
+    np.testing.assert_array_equal(serial.terminal, parallel.terminal)
+    np.testing.assert_array_equal(
+        serial.percentile(20), parallel.percentile(20)
+    )
+    # Shards send summaries back, never their path matrices
+    assert not serial.rates.exact
+
+
+def test_merged_summary_matches_full_sample(curve):
+    summary = run_scenarios(
+        curve, A, SIGMA, TIMES, 20000, seed=1, shard_size=3000
+    )
+
+    alpha = hw_alpha(instantaneous_forwards(curve, TIMES), TIMES, A, SIGMA)
+    std = hw_std(A, SIGMA, TIMES)
+    # Four standard errors of the sample mean
+    tolerance = 4 * std / np.sqrt(20000) + 1e-9
+    assert summary.count == 20000
+    assert np.all(np.abs(summary.mean - alpha) <= tolerance)
+    np.testing.assert_allclose(summary.std[1:], std[1:], rtol=0.03)
+    for q in [20, 50, 80]:
+        expected = alpha + norm.ppf(q / 100) * std
+        error = np.abs(summary.percentile(q) - expected)
+        assert np.all(error <= 1.5 * tolerance + 1e-6)
+
+
+def test_sample_paths_are_the_first_paths_of_the_run(curve):
+    summary = run_scenarios(
+        curve, A, SIGMA, TIMES, 10, seed=3, keep_terminal=True
+    )
+    sample = sample_paths(curve, A, SIGMA, TIMES, 10, seed=3)
+
+    np.testing.assert_allclose(sample[:, -1], summary.terminal)
+
+
+def test_payment_statistics_merge_across_shards(curve):
+    summary = run_scenarios(
+        curve,
+        A,
+        SIGMA,
+        TIMES,
+        40,
+        seed=2,
+        shard_size=15,
+        mortgage=(1e5, 10),
+        sampling="sobol",
+    )
+    paths = sample_paths(curve, A, SIGMA, TIMES, 40, seed=2, sampling="sobol")
+    _, payments, _ = amortize(paths, TIMES, 1e5, 10)
+
+    statistics = summary.payment_statistics()
+    assert set(statistics) == {"total_paid", "first_payment"}
+    totals = payments.sum(axis=1)
+    assert statistics["total_paid"]["mean"] == pytest.approx(totals.mean())
+    assert statistics["total_paid"]["std"] == pytest.approx(totals.std(ddof=1))
+    assert statistics["first_payment"]["mean"] == pytest.approx(
+        payments[:, 0].mean()
+    )
+
+
+def test_sobol_shards_are_blocks_of_one_sequence(curve):
+    whole = run_scenarios(
+        curve,
+        A,
+        SIGMA,
+        TIMES,
+        256,
+        seed=4,
+        sampling="sobol",
+        keep_terminal=True,
+    )
+    sharded = run_scenarios(
+        curve,
+        A,
+        SIGMA,
+        TIMES,
+        256,
+        seed=4,
+        workers=2,
+        shard_size=64,
+        sampling="sobol",
+        keep_terminal=True,
+    )
+
+    np.testing.assert_allclose(sharded.terminal, whole.terminal)
+    np.testing.assert_array_equal(sharded.histogram, whole.histogram)
+
+
+def test_sobol_beats_pseudo_random_sampling(curve):
+    report = scenarios.convergence_report(
+        curve,
+        A,
+        SIGMA,
+        TIMES,
+        path_counts=(256,),
+        repeats=4,
+        mortgage=(1e5, 10),
+        reference_paths=8192,
+    ).set_index("sampling")
+
+    band_errors = report["band_error"]
+    assert band_errors["sobol"] < band_errors["pseudo"]
+    assert (
+        report.loc["sobol", "payment_error"]
+        < report.loc["pseudo", "payment_error"] / 5
+    )
+
+
+def test_sobol_shards_are_powers_of_two(curve, monkeypatch):
+    sizes = []
+    normals = scenarios.shard_normals
+
+    def shard_normals(sampling, seed, shard_seed, offset, size, *args):
+        sizes.append(size)
+        return normals(sampling, seed, shard_seed, offset, size, *args)
+
+    monkeypatch.setattr(scenarios, "shard_normals", shard_normals)
+    run_scenarios(
+        curve, A, SIGMA, TIMES, 300, shard_size=100, sampling="sobol"
+    )
+
+    assert sizes == [128, 128, 44]
@@ -0,0 +1,46 @@
+import pickle
+
+import numpy as np
+import pytest
+import QuantLib as ql
+
+from finance.snapshot import CurveSnapshot, accuracy_report
+from finance.utils import curve_values
+
+
+def test_daily_snapshot_reproduces_curve(curve):
+    snapshot = CurveSnapshot.from_curve(curve)
+
+    report = accuracy_report(snapshot, curve, samples=500)
+
+    assert report["discount"] < 1e-9
+    assert report["forward_1M"] < 1e-12
+    assert report["forward_6M"] < 1e-12
+
+
+def test_snapshot_evaluates_like_the_curve(curve):
+    snapshot = pickle.loads(pickle.dumps(CurveSnapshot.from_curve(curve)))
+
+    times, rates = curve_values(snapshot, "6M", horizon="10Y")
+    expected_times, expected_rates = curve_values(curve, "6M", horizon="10Y")
+    assert times == expected_times
+    np.testing.assert_allclose(rates, expected_rates, rtol=1e-12)
+
+    times = np.array([0.5, 3.0, 12.0])
+    np.testing.assert_allclose(
+        snapshot.instantaneous_forward(times),
+        [
+            curve.forwardRate(t, t, ql.Continuous, ql.NoFrequency).rate()
+            for t in times
+        ],
+        atol=1e-6,
+    )
+
+
+def test_snapshot_extrapolates_only_when_asked(curve):
+    snapshot = CurveSnapshot.from_curve(curve, horizon="10Y")
+
+    assert snapshot.discount(15.0) < snapshot.discount(10.0)
+    assert snapshot.discount(5.0, extrapolate=False) == snapshot.discount(5.0)
+    with pytest.raises(ValueError):
+        snapshot.discount([5.0, 15.0], extrapolate=False)
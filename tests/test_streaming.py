@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from finance.streaming import StreamingStats
+
+STEPS = 5
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    return rng.normal(np.arange(STEPS), 1 + np.arange(STEPS), (4000, STEPS))
+
+
+def stats(exact_values):
+    std = 1 + np.arange(STEPS)
+    return StreamingStats(
+        np.arange(STEPS) - 6 * std,
+        np.arange(STEPS) + 6 * std,
+        exact_values=exact_values,
+    )
+
+
+def test_quantiles_are_exact_below_the_limit(values):
+    streamed = stats(exact_values=values.size)
+    for chunk in np.array_split(values, 7):
+        streamed.add(chunk)
+
+    assert streamed.exact
+    np.testing.assert_allclose(streamed.mean, values.mean(axis=0))
+    np.testing.assert_allclose(streamed.std, values.std(axis=0, ddof=1))
+    for q in [5, 50, 80]:
+        np.testing.assert_array_equal(
+            streamed.percentile(q), np.percentile(values, q, axis=0)
+        )
+
+
+def test_sketch_takes_over_above_the_limit(values):
+    streamed = stats(exact_values=1000)
+    for chunk in np.array_split(values, 7):
+        streamed.add(chunk)
+
+    assert not streamed.exact
+    width = (streamed.upper - streamed.lower) / streamed.histogram.shape[1]
+    for q in [5, 50, 80]:
+        error = np.abs(streamed.percentile(q) - np.percentile(values, q, 0))
+        assert np.all(error <= width)
+    np.testing.assert_allclose(streamed.mean, values.mean(axis=0))
+
+
+def test_merging_matches_a_single_stream(values):
+    single = stats(exact_values=values.size)
+    single.add(values)
+    first, second = stats(values.size), stats(values.size)
+    first.add(values[:1500])
+    second.add(values[1500:])
+    merged = first.merge(second)
+
+    np.testing.assert_array_equal(merged.histogram, single.histogram)
+    np.testing.assert_allclose(merged.m2, single.m2)
+    np.testing.assert_array_equal(merged.percentile(20), single.percentile(20))
+
+    small = stats(exact_values=values.size - 1).merge(first).merge(second)
+    assert not small.exact
@@ -0,0 +1,80 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+import QuantLib as ql
+
+from finance.dates import epoch_days, ql_epoch_days, schedule
+from finance.utils import curve_values, forward_rates
+
+
+@pytest.mark.parametrize(
+    "start, horizon, step",
+    [
+        (ql.Date(31, 1, 2024), "5Y", "1M"),
+        (ql.Date(16, 10, 2024), "30Y", "1D"),
+        (ql.Date(29, 2, 2028), "5Y", "7M"),
+        (ql.Date(30, 8, 2025), "1Y", "2W"),
+    ],
+)
+def test_schedule_matches_make_schedule(start, horizon, step):
+    end = start + ql.Period(horizon)
+    expected = ql_epoch_days(ql.MakeSchedule(start, end, ql.Period(step)))
+
+    assert list(schedule(start, end, ql.Period(step))) == list(expected)
+
+
+@pytest.mark.parametrize(
+    "dates",
+    [
+        [date(1969, 12, 31), date(2024, 10, 16)],
+        [datetime(1969, 12, 31, 23), datetime(2024, 10, 16, 12)],
+        pd.Series([pd.Timestamp("1969-12-31"), pd.Timestamp("2024-10-16")]),
+        np.array(["1969-12-31", "2024-10-16"], dtype="datetime64[D]"),
+        ["1969-12-31", "2024-10-16"],
+    ],
+)
+def test_epoch_days(dates):
+    assert epoch_days(dates).tolist() == [-1, 20012]
+
+
+@pytest.mark.parametrize(
+    "day_counter, compounding",
+    [
+        (ql.Actual360(), ql.Simple),
+        (ql.Actual365Fixed(), ql.Continuous),
+        (ql.Thirty360(ql.Thirty360.BondBasis), ql.Compounded),
+    ],
+)
+def test_forward_rates_match_quantlib(curve, day_counter, compounding):
+    calendar = ql.TARGET()
+    dates = [curve.referenceDate() + n * 11 for n in range(300)]
+
+    _, rates = forward_rates(
+        curve,
+        ql_epoch_days(dates),
+        "6M",
+        day_counter,
+        compounding,
+        ql.Semiannual,
+    )
+
+    expected = [
+        curve.forwardRate(
+            date,
+            calendar.advance(date, ql.Period("6M")),
+            day_counter,
+            compounding,
+            ql.Semiannual,
+        ).rate()
+        for date in dates
+    ]
+    np.testing.assert_allclose(rates, expected, rtol=0, atol=1e-14)
+
+
+def test_curve_values_horizon_and_step(curve):
+    times, rates = curve_values(curve, "3M", horizon="2Y", step="1D")
+
+    assert len(times) == len(rates) == 731
+    assert times[1] - times[0] == 86400
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance.calibrate import calculate_volatility, fill_missing_dates
+from finance.volatility import VOLATILITY_WINDOWS, VolatilitySurface
+
+
+@pytest.fixture
+def fixings():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2000-01-03", "2024-10-16")
+    # Crosses zero, so some returns are not a number and are skipped
+    rates = 2 + np.cumsum(rng.normal(0, 0.02, len(dates)))
+    return pd.DataFrame({"date": dates, "rate": rates})
+
+
+def rolling_volatility(df):
+    """The six pandas rolling passes the surface replaces."""
+    df = fill_missing_dates(df.sort_values(by="date"))
+    with np.errstate(invalid="ignore"):
+        df["Log Return"] = np.log(df["rate"] / df["rate"].shift(1))
+    df = df.dropna()
+    surface = pd.DataFrame({"Date": df["date"]})
+    for label, window in VOLATILITY_WINDOWS.items():
+        surface[f"{label} Volatility"] = df["Log Return"].rolling(
+            window
+        ).std() * np.sqrt(252)
+    return surface.dropna()
+
+
+def test_surface_matches_rolling_std(fixings):
+    expected = rolling_volatility(fixings.copy())
+    surface = calculate_volatility(fixings)
+
+    assert (fixings["rate"] < 0).any()
+    pd.testing.assert_index_equal(surface.index, expected.index)
+    pd.testing.assert_frame_equal(surface, expected, rtol=1e-8)
+
+
+def test_zero_fixings_are_skipped(fixings):
+    fixings.loc[len(fixings) // 2, "rate"] = 0.0
+    surface = calculate_volatility(fixings)
+    columns = [f"{label} Volatility" for label in VOLATILITY_WINDOWS]
+
+    assert len(surface) > 0
+    assert np.isfinite(surface[columns].to_numpy()).all()
+
+
+def test_incremental_updates_return_only_new_rows(fixings):
+    full = calculate_volatility(fixings)
+    surface = VolatilitySurface()
+
+    first = surface.update(fixings.iloc[:-300])
+    # Old and overlapping rows are ignored
+    second = surface.update(fixings.iloc[-400:])
+
+    assert second.index.min() > first.index.max()
+    assert len(first) + len(second) == len(full)
+    pd.testing.assert_frame_equal(surface.surface, full, rtol=1e-8)
+    assert surface.update(fixings).empty